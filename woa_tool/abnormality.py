@@ -6,6 +6,11 @@ directly from radiomic z-scores of the input image.
 
 import numpy as np
 
+# Feature z-scores read by infer_abnormality
+ABNORMALITY_INPUTS = (
+    "glcm_entropy", "glcm_contrast", "glcm_variance",
+    "shape_extent", "shape_eccentricity", "spic_orient_dispersion", "hist_mean",
+)
 
 def _clip01(x):
     """Clamp value between 0 and 1."""
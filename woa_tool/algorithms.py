@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import time
+import traceback
+import multiprocessing as mp
 import numpy as np
-from typing import Callable, Tuple, Dict, Any, Optional
-
-from .utils import ensure_bounds, initialize_population, population_diversity
-from .fitness import evaluate_population
-from .metrics import RunHistory
+from concurrent.futures import Executor
+from typing import Callable, Tuple, Dict, Any, List, Optional, Sequence
+
+from .utils import SeedLike, ensure_bounds, initialize_population, make_rng, population_diversity, spawn_seeds
+from .fitness import CachedObjective, evaluate_population, find_objective
+from .metrics import RunHistory, merge_histories
+from .checkpoint import Checkpointer
+from .callbacks import Callback, IterationEvent, close_all, notify
 from .adaptive import (
     a_linear,
     a_sin,
@@ -41,80 +46,291 @@ def _compute_a(strategy: str, t: int, T: int, diversity: float, diversity_aware:
     return float(np.clip(a_val, 0.0, 2.0))
 
 
+def _draw_moves(a: float, pop_size: int, rng: np.random.Generator) -> Tuple[np.ndarray, ...]:
+    """Random coefficients of one WOA step for `pop_size` whales.
+
+    Draws in the same order as a per-whale loop: r, p, l for the whole
+    population, then one random whale index per exploring whale in index
+    order. Returns (A, C, p, l, rand_idx); `rand_idx` has an entry per whale,
+    its own index where the whale does not explore.
+    """
+    r = rng.random((pop_size, 1))
+    A = 2 * a * r - a
+    C = 2 * r
+    p = rng.random((pop_size, 1))
+    l = rng.uniform(-1, 1, size=(pop_size, 1))
+    explore = (p[:, 0] < 0.5) & ~(np.abs(A[:, 0]) < 1)
+    rand_idx = np.arange(pop_size)
+    rand_idx[explore] = rng.integers(pop_size, size=int(explore.sum()))
+    return A, C, p, l, rand_idx
+
+
+def _apply_moves(
+    population: np.ndarray,
+    best: np.ndarray,
+    A: np.ndarray,
+    C: np.ndarray,
+    p: np.ndarray,
+    l: np.ndarray,
+    Xrand: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Move every whale at once; leading axes of `population` may stack runs.
+
+    `best` is broadcastable to `population`, A/C/p/l have a trailing axis of
+    one, and `Xrand` has the shape of `population` (only rows of exploring
+    whales are used). Every move is computed for every whale and the right
+    one picked with `np.where`, which is cheaper than boolean-mask indexing.
+    Returns the new population and the exploration mask.
+    """
+    encircle = p < 0.5
+    exploit = encircle & (np.abs(A) < 1)
+    explore = encircle & ~exploit
+
+    # Shrinking encircling around the best whale, or search for prey around a
+    # randomly chosen whale: the same update with a different target
+    # (in-place steps keep temporaries down; the arithmetic order is unchanged)
+    target = np.where(exploit, best, Xrand)
+    D = C * target
+    D -= population
+    np.abs(D, out=D)
+    D *= A
+    encircled = np.subtract(target, D, out=target)
+
+    # Logarithmic spiral towards the best whale
+    b = 1.0
+    D = np.subtract(best, population, out=D)
+    np.abs(D, out=D)
+    D *= np.exp(b * l)
+    D *= np.cos(2 * np.pi * l)
+    spiraled = np.add(D, best, out=D)
+
+    return np.where(encircle, encircled, spiraled), explore[..., 0]
+
+
+def _record_moves(history: RunHistory, exp_ct: int, expt_ct: int) -> None:
+    history.exploration_steps += exp_ct
+    history.exploitation_steps += expt_ct
+    history.exploration_count_per_iter.append(exp_ct)
+    history.exploitation_count_per_iter.append(expt_ct)
+
+
+def _update_positions(
+    population: np.ndarray,
+    best_pos: np.ndarray,
+    a: float,
+    history: RunHistory,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Apply one WOA move to every whale at once.
+
+    Random numbers are drawn from `rng` as a per-whale loop would draw them. Exploration/exploitation counts are
+    recorded on ``history``.
+    """
+    pop_size = population.shape[0]
+    A, C, p, l, rand_idx = _draw_moves(a, pop_size, rng)
+    new_population, explore = _apply_moves(population, best_pos, A, C, p, l, population[rand_idx])
+    exp_ct = int(explore.sum())
+    _record_moves(history, exp_ct, pop_size - exp_ct)
+    return new_population
+
+
+def _evaluate(pop: np.ndarray, objective: Callable, executor: Optional[Executor], history: RunHistory) -> np.ndarray:
+    history.evaluations += int(pop.shape[0])
+    start = time.perf_counter()
+    fit = evaluate_population(pop, objective, executor)
+    history.eval_seconds += time.perf_counter() - start
+    return fit
+
+
+def _emit(
+    callbacks: Optional[Sequence[Callback]],
+    algo: str,
+    t: int,
+    iters: int,
+    a: float,
+    history: RunHistory,
+    objective: Callable,
+    eval_seconds_before: float,
+) -> bool:
+    """Build this iteration's event from `history` and pass it to the callbacks."""
+    if not callbacks:
+        return False
+    eval_ms = (history.eval_seconds - eval_seconds_before) * 1000.0
+    # Under surrogate/fidelity wrappers the fitness cache sits further in
+    cache = find_objective(objective, CachedObjective)
+    event = IterationEvent(
+        algo=algo,
+        t=t,
+        iters=iters,
+        best_fitness=float(history.best_fitness_per_iter[-1]),
+        diversity=float(history.diversity_per_iter[-1]),
+        a=float(a),
+        evaluations=history.evaluations,
+        eval_ms=eval_ms,
+        update_ms=max(0.0, history.times_ms_per_iter[-1] - eval_ms),
+        cache_hits=cache.hits if cache is not None else None,
+        cache_misses=cache.misses if cache is not None else None,
+    )
+    return notify(callbacks, event)
+
+
+def _scheduled_size(
+    schedule: str,
+    t: int,
+    iters: int,
+    pop_size: int,
+    min_pop_size: int,
+    current: int,
+    history: RunHistory,
+) -> int:
+    """Population size for iteration t + 1; never grows and never drops below `min_pop_size`."""
+    floor = min(pop_size, max(1, min_pop_size))
+    if schedule == "linear":
+        target = pop_size - (pop_size - floor) * t / float(iters)
+    else:
+        # Shrink in proportion to the diversity lost since the first iteration
+        ref = history.diversity_per_iter[0]
+        ratio = history.diversity_per_iter[-1] / ref if ref > 0 else 0.0
+        target = floor + (pop_size - floor) * min(1.0, ratio)
+    return max(floor, min(current, int(round(target))))
+
+
+def _seed_population(population: np.ndarray, init_population: Optional[np.ndarray], bounds) -> np.ndarray:
+    # Warm start: the first rows of a random population are replaced by given whales
+    if init_population is None:
+        return population
+    seeds = np.atleast_2d(np.asarray(init_population, dtype=float))[: population.shape[0]]
+    population[: len(seeds)] = ensure_bounds(seeds, bounds[0], bounds[1])
+    return population
+
+
+def _unpack_checkpoint(state: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, RunHistory, int]:
+    return (
+        state["population"], state["fitness"], state["best_pos"].copy(),
+        state["best_fit"], state["history"], state["t"] + 1,
+    )
+
+
+def _stop_reason(
+    history: RunHistory,
+    run_start: float,
+    max_evals: Optional[int],
+    max_time: Optional[float],
+    patience: Optional[int],
+    tol: float,
+) -> Optional[str]:
+    """Early-stopping check run after each iteration (budgets may overshoot by one iteration)."""
+    if max_evals is not None and history.evaluations >= max_evals:
+        return "max_evals"
+    if max_time is not None and time.time() - run_start >= max_time:
+        return "max_time"
+    best = history.best_fitness_per_iter
+    if patience is not None and patience > 0 and len(best) > patience:
+        if best[-patience - 1] - best[-1] <= tol:
+            return "stagnation"
+    return None
+
+
+def _resume_finished(
+    state: Dict[str, Any],
+    history: RunHistory,
+    iters: int,
+    run_start: float,
+    max_evals: Optional[int],
+    max_time: Optional[float],
+    patience: Optional[int],
+    tol: float,
+) -> bool:
+    """
+    Whether a run restored from a finished checkpoint has nothing left to do:
+    it already reached `iters`, or one of its stop conditions still holds.
+    Otherwise (e.g. `iters` was raised) it continues as a max_iters run.
+    """
+    if state["t"] >= iters:
+        return True
+    reason = _stop_reason(history, run_start, max_evals, max_time, patience, tol)
+    if reason is not None:
+        history.stop_reason = reason
+        return True
+    history.stop_reason = "max_iters"
+    return False
+
+
 def run_woa(
     objective: Callable[[np.ndarray], float],
     dim: int,
     bounds: Tuple[np.ndarray, np.ndarray],
     pop_size: int = 30,
     iters: int = 100,
-    seed: Optional[int] = None,
+    seed: SeedLike = None,
+    executor: Optional[Executor] = None,
+    rng: Optional[np.random.Generator] = None,
+    max_evals: Optional[int] = None,
+    max_time: Optional[float] = None,
+    patience: Optional[int] = None,
+    tol: float = 0.0,
+    checkpointer: Optional[Checkpointer] = None,
+    callbacks: Optional[Sequence[Callback]] = None,
+    init_population: Optional[np.ndarray] = None,
 ) -> Tuple[np.ndarray, float, RunHistory]:
-    if seed is not None:
-        np.random.seed(seed)
-
-    population = initialize_population(pop_size, dim, bounds)
-    fitness = evaluate_population(population, objective)
-
-    best_idx = int(np.argmin(fitness))
-    best_pos = population[best_idx].copy()
-    best_fit = float(fitness[best_idx])
-
+    rng = make_rng(seed, rng)
     history = RunHistory()
+    run_start = time.time()
+    resumed = checkpointer.restore(pop_size, dim, rng) if checkpointer is not None else None
+
+    if resumed is not None:
+        population, fitness, best_pos, best_fit, history, first_t = _unpack_checkpoint(resumed)
+        # The time budget covers the whole run, not each restart
+        run_start -= resumed["elapsed"]
+        if resumed["done"] and _resume_finished(resumed, history, iters, run_start, max_evals, max_time, patience, tol):
+            return best_pos, best_fit, history
+    else:
+        population = _seed_population(initialize_population(pop_size, dim, bounds, rng), init_population, bounds)
+        fitness = _evaluate(population, objective, executor, history)
 
-    for t in range(1, iters + 1):
+        best_idx = int(np.argmin(fitness))
+        best_pos = population[best_idx].copy()
+        best_fit = float(fitness[best_idx])
+        first_t = 1
+
+    for t in range(first_t, iters + 1):
         start = time.time()
+        eval_seconds_before = history.eval_seconds
         a = a_linear(t, iters)
-        r = np.random.rand(pop_size, 1)
-        A = 2 * a * r - a
-        C = 2 * r
-        p = np.random.rand(pop_size, 1)
-        l = np.random.uniform(-1, 1, size=(pop_size, 1))
-
-        new_population = population.copy()
-        exp_ct = 0
-        expt_ct = 0
-
-        for i in range(pop_size):
-            if p[i] < 0.5:
-                if abs(A[i, 0]) < 1:
-                    expt_ct += 1
-                    history.exploitation_steps += 1
-                    D = np.abs(C[i, 0] * best_pos - population[i])
-                    new_population[i] = best_pos - A[i, 0] * D
-                else:
-                    exp_ct += 1
-                    history.exploration_steps += 1
-                    rand_idx = np.random.randint(pop_size)
-                    Xrand = population[rand_idx]
-                    D = np.abs(C[i, 0] * Xrand - population[i])
-                    new_population[i] = Xrand - A[i, 0] * D
-            else:
-                expt_ct += 1
-                history.exploitation_steps += 1
-                D = np.abs(best_pos - population[i])
-                b = 1.0
-                new_population[i] = (
-                    D * np.exp(b * l[i, 0]) * np.cos(2 * np.pi * l[i, 0]) + best_pos
-                )
-
-        history.exploration_count_per_iter.append(exp_ct)
-        history.exploitation_count_per_iter.append(expt_ct)
-
+        new_population = _update_positions(population, best_pos, a, history, rng)
         new_population = ensure_bounds(new_population, bounds[0], bounds[1])
         population = new_population
 
-        fitness = evaluate_population(population, objective)
+        fitness = _evaluate(population, objective, executor, history)
         current_best_idx = int(np.argmin(fitness))
         current_best_fit = float(fitness[current_best_idx])
         if current_best_fit < best_fit:
             best_fit = current_best_fit
             best_pos = population[current_best_idx].copy()
 
+        history.pop_size_per_iter.append(int(population.shape[0]))
         history.best_fitness_per_iter.append(best_fit)
         history.times_ms_per_iter.append((time.time() - start) * 1000.0)
         # Track population diversity for summaries
         history.diversity_per_iter.append(float(population_diversity(population)))
 
+        stop_requested = _emit(callbacks, "woa", t, iters, a, history, objective, eval_seconds_before)
+        reason = _stop_reason(history, run_start, max_evals, max_time, patience, tol)
+        if reason is None and stop_requested:
+            reason = "callback"
+        if reason is not None:
+            history.stop_reason = reason
+            break
+        if checkpointer is not None and checkpointer.due(t):
+            checkpointer.save(t, population, fitness, best_pos, best_fit, rng, history,
+                                  elapsed=time.time() - run_start)
+
+    if checkpointer is not None:
+        last_t = len(history.best_fitness_per_iter)
+        checkpointer.save(last_t, population, fitness, best_pos, best_fit, rng, history, done=True,
+                          elapsed=time.time() - run_start)
+    close_all(callbacks)
+
     return best_pos, best_fit, history
 
 
@@ -130,93 +346,236 @@ def run_ewoa(
     use_obl: bool = True,
     obl_freq: int = 1,
     obl_rate: float = 1.0,
-    seed: Optional[int] = None,
+    seed: SeedLike = None,
+    executor: Optional[Executor] = None,
+    exchange: Optional[Callable[[int, np.ndarray, np.ndarray, RunHistory], Optional[Tuple[np.ndarray, np.ndarray]]]] = None,
+    rng: Optional[np.random.Generator] = None,
+    max_evals: Optional[int] = None,
+    max_time: Optional[float] = None,
+    patience: Optional[int] = None,
+    tol: float = 0.0,
+    checkpointer: Optional[Checkpointer] = None,
+    callbacks: Optional[Sequence[Callback]] = None,
+    init_population: Optional[np.ndarray] = None,
+    pop_schedule: Optional[str] = None,
+    min_pop_size: int = 4,
 ) -> Tuple[np.ndarray, float, RunHistory]:
-    if seed is not None:
-        np.random.seed(seed)
-
-    population = initialize_population(pop_size, dim, bounds)
-    fitness = evaluate_population(population, objective)
-
-    if use_obl:
-        population_opp = opposite(population, bounds)
-        population_opp = ensure_bounds(population_opp, bounds[0], bounds[1])
-        fitness_opp = evaluate_population(population_opp, objective)
-        population, fitness = select_better(population, population_opp, fitness, fitness_opp)
+    # `exchange(t, population, fitness, history)` runs after each iteration's evaluation and may
+    # return a replacement (population, fitness); the island model uses it for migration.
+    # `pop_schedule` ("linear" or "diversity") shrinks the population towards
+    # `min_pop_size` over the run by dropping the worst whales.
+    if pop_schedule not in (None, "linear", "diversity"):
+        raise ValueError(f"Unknown population schedule: {pop_schedule}")
+    rng = make_rng(seed, rng)
+    history = RunHistory()
+    run_start = time.time()
+    resumed = checkpointer.restore(pop_size, dim, rng) if checkpointer is not None else None
+
+    if resumed is not None:
+        population, fitness, best_pos, best_fit, history, first_t = _unpack_checkpoint(resumed)
+        # The time budget covers the whole run, not each restart
+        run_start -= resumed["elapsed"]
+        if resumed["done"] and _resume_finished(resumed, history, iters, run_start, max_evals, max_time, patience, tol):
+            return best_pos, best_fit, history
+    else:
+        population = _seed_population(initialize_population(pop_size, dim, bounds, rng), init_population, bounds)
+        fitness = _evaluate(population, objective, executor, history)
 
-    best_idx = int(np.argmin(fitness))
-    best_pos = population[best_idx].copy()
-    best_fit = float(fitness[best_idx])
+        if use_obl:
+            population_opp = opposite(population, bounds)
+            population_opp = ensure_bounds(population_opp, bounds[0], bounds[1])
+            fitness_opp = _evaluate(population_opp, objective, executor, history)
+            population, fitness = select_better(population, population_opp, fitness, fitness_opp)
 
-    history = RunHistory()
+        best_idx = int(np.argmin(fitness))
+        best_pos = population[best_idx].copy()
+        best_fit = float(fitness[best_idx])
+        first_t = 1
 
-    for t in range(1, iters + 1):
+    for t in range(first_t, iters + 1):
         start = time.time()
+        eval_seconds_before = history.eval_seconds
         div = population_diversity(population)
         a = _compute_a(a_strategy, t, iters, div, diversity_aware, adaptive_a)
-        r = np.random.rand(pop_size, 1)
-        A = 2 * a * r - a
-        C = 2 * r
-        p = np.random.rand(pop_size, 1)
-        l = np.random.uniform(-1, 1, size=(pop_size, 1))
-
-        new_population = population.copy()
-        exp_ct = 0
-        expt_ct = 0
-
-        for i in range(pop_size):
-            if p[i] < 0.5:
-                if abs(A[i, 0]) < 1:
-                    expt_ct += 1
-                    history.exploitation_steps += 1
-                    D = np.abs(C[i, 0] * best_pos - population[i])
-                    new_population[i] = best_pos - A[i, 0] * D
-                else:
-                    exp_ct += 1
-                    history.exploration_steps += 1
-                    rand_idx = np.random.randint(pop_size)
-                    Xrand = population[rand_idx]
-                    D = np.abs(C[i, 0] * Xrand - population[i])
-                    new_population[i] = Xrand - A[i, 0] * D
-            else:
-                expt_ct += 1
-                history.exploitation_steps += 1
-                D = np.abs(best_pos - population[i])
-                b = 1.0
-                new_population[i] = (
-                    D * np.exp(b * l[i, 0]) * np.cos(2 * np.pi * l[i, 0]) + best_pos
-                )
-
-        history.exploration_count_per_iter.append(exp_ct)
-        history.exploitation_count_per_iter.append(expt_ct)
-
+        new_population = _update_positions(population, best_pos, a, history, rng)
         new_population = ensure_bounds(new_population, bounds[0], bounds[1])
 
+        fit_new = _evaluate(new_population, objective, executor, history)
+
+        n = new_population.shape[0]
         if use_obl and (obl_freq > 0) and (t % obl_freq == 0):
-            # Apply OBL to a fraction of the population
-            count = max(1, int(pop_size * obl_rate))
-            idx = np.random.permutation(pop_size)[:count]
+            # Apply OBL to a fraction of the population; only the opposite
+            # points need scoring, the selected whales were scored above
+            count = max(1, int(n * obl_rate))
+            idx = rng.permutation(n)[:count]
             opp = opposite(new_population[idx], bounds)
             opp = ensure_bounds(opp, bounds[0], bounds[1])
-            fit_new_sel = evaluate_population(new_population[idx], objective)
-            fit_opp_sel = evaluate_population(opp, objective)
+            fit_opp_sel = _evaluate(opp, objective, executor, history)
             # selective replacement
-            mask = fit_opp_sel < fit_new_sel
+            mask = fit_opp_sel < fit_new[idx]
             new_population[idx[mask]] = opp[mask]
+            fit_new[idx[mask]] = fit_opp_sel[mask]
 
-        fit_new = evaluate_population(new_population, objective)
         population = new_population
         fitness = fit_new
 
+        if exchange is not None:
+            swapped = exchange(t, population, fitness, history)
+            if swapped is not None:
+                population, fitness = swapped
+
         current_best_idx = int(np.argmin(fitness))
         current_best_fit = float(fitness[current_best_idx])
         if current_best_fit < best_fit:
             best_fit = current_best_fit
             best_pos = population[current_best_idx].copy()
 
+        history.pop_size_per_iter.append(n)
         history.best_fitness_per_iter.append(best_fit)
         history.times_ms_per_iter.append((time.time() - start) * 1000.0)
         history.diversity_per_iter.append(float(population_diversity(population)))
 
+        if pop_schedule is not None:
+            keep = _scheduled_size(pop_schedule, t, iters, pop_size, min_pop_size, population.shape[0], history)
+            if keep < population.shape[0]:
+                survivors = np.argsort(fitness, kind="stable")[:keep]
+                population, fitness = population[survivors], fitness[survivors]
+
+        stop_requested = _emit(callbacks, "ewoa", t, iters, a, history, objective, eval_seconds_before)
+        reason = _stop_reason(history, run_start, max_evals, max_time, patience, tol)
+        if reason is None and stop_requested:
+            reason = "callback"
+        if reason is not None:
+            history.stop_reason = reason
+            break
+        if checkpointer is not None and checkpointer.due(t):
+            checkpointer.save(t, population, fitness, best_pos, best_fit, rng, history,
+                                  elapsed=time.time() - run_start)
+
+    if checkpointer is not None:
+        last_t = len(history.best_fitness_per_iter)
+        checkpointer.save(last_t, population, fitness, best_pos, best_fit, rng, history, done=True,
+                          elapsed=time.time() - run_start)
+    close_all(callbacks)
+
     return best_pos, best_fit, history
 
+
+def _reseed_objective(objective, seed: SeedLike) -> None:
+    # Wrappers that draw random numbers (e.g. surrogate exploration) arrive on every
+    # island with the same pickled Generator; give each island a stream of its own
+    while objective is not None:
+        if isinstance(getattr(objective, "rng", None), np.random.Generator):
+            objective.rng = np.random.default_rng(spawn_seeds(seed, 1)[0])
+        objective = getattr(objective, "objective", None)
+
+
+def _island_worker(conn, objective, dim, bounds, kwargs, migrate_every, migrants) -> None:
+    def exchange(t, population, fitness, history):
+        if migrate_every <= 0 or t % migrate_every != 0:
+            return None
+        order = np.argsort(fitness)
+        conn.send(("migrants", population[order[:migrants]].copy()))
+        (imm_pos,) = conn.recv()
+        # Immigrants replace this island's worst whales, always leaving its best;
+        # a shrunken population may take fewer than were sent
+        k = min(len(imm_pos), len(population) - 1)
+        if k <= 0:
+            return None
+        # The sender's score may be a partial-fold or predicted one, so immigrants are
+        # re-scored here; any such score from this island's objective stays above its
+        # best full score, so it cannot become the island's best
+        imm_pos = imm_pos[:k]
+        imm_fit = _evaluate(imm_pos, objective, kwargs.get("executor"), history)
+        worst = order[::-1][:k]
+        population, fitness = population.copy(), fitness.copy()
+        population[worst] = imm_pos
+        fitness[worst] = imm_fit
+        return population, fitness
+
+    try:
+        _reseed_objective(objective, kwargs.get("seed"))
+        best_pos, best_fit, history = run_ewoa(objective, dim, bounds, exchange=exchange, **kwargs)
+        conn.send(("done", best_pos, best_fit, history))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def run_ewoa_islands(
+    objective: Callable[[np.ndarray], float],
+    dim: int,
+    bounds: Tuple[np.ndarray, np.ndarray],
+    islands: int = 4,
+    migrate_every: int = 10,
+    migrants: int = 1,
+    pop_size: int = 30,
+    iters: int = 100,
+    island_kwargs: Optional[List[Dict[str, Any]]] = None,
+    seed: SeedLike = None,
+    **kwargs: Any,
+) -> Tuple[np.ndarray, float, RunHistory]:
+    """
+    Island-model EWOA: `islands` sub-populations run `run_ewoa` in separate
+    processes and, every `migrate_every` iterations, each sends its best
+    `migrants` whales to the next island in a ring, where they are re-scored
+    with that island's objective and replace its worst ones. `kwargs` are shared `run_ewoa` settings; `island_kwargs[k]`
+    overrides them for island k (e.g. a different `a_strategy` or OBL rate).
+    Island k draws from child k of `SeedSequence(seed)`. The objective must be
+    picklable. Returns the overall best and a history merged with
+    `merge_histories`.
+    """
+    if migrate_every > 0 and migrants >= pop_size:
+        raise ValueError("migrants must be smaller than pop_size")
+
+    conns, procs = [], []
+    for k, island_seed in enumerate(spawn_seeds(seed, islands)):
+        cfg = dict(kwargs, pop_size=pop_size, iters=iters, seed=island_seed)
+        if island_kwargs is not None and k < len(island_kwargs):
+            cfg.update(island_kwargs[k])
+        parent, child = mp.Pipe()
+        proc = mp.Process(
+            target=_island_worker,
+            args=(child, objective, dim, bounds, cfg, migrate_every, migrants),
+            daemon=True,
+        )
+        proc.start()
+        child.close()
+        conns.append(parent)
+        procs.append(proc)
+
+    def receive(conn):
+        msg = conn.recv()
+        if msg[0] == "error":
+            for p in procs:
+                p.terminate()
+            raise RuntimeError(f"EWOA island failed:\n{msg[1]}")
+        return msg
+
+    try:
+        # Each round every running island either sends migrants or finishes;
+        # migrants travel around the ring of islands still running.
+        results = {}
+        active = list(range(islands))
+        while active:
+            msgs = {k: receive(conns[k]) for k in active}
+            for k in list(active):
+                if msgs[k][0] == "done":
+                    results[k] = msgs[k]
+                    active.remove(k)
+            for i, k in enumerate(active):
+                if len(active) > 1:
+                    conns[k].send(msgs[active[i - 1]][1:])
+                else:
+                    conns[k].send((np.empty((0, dim)),))
+        results = [results[k] for k in range(islands)]
+    finally:
+        for conn in conns:
+            conn.close()
+        for p in procs:
+            p.join()
+
+    best = min(results, key=lambda msg: msg[2])
+    history = merge_histories([msg[3] for msg in results])
+    return best[1], float(best[2]), history
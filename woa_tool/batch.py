@@ -0,0 +1,205 @@
+"""
+Multi-run optimizers for benchmark experiments.
+
+`run_woa_batch` / `run_ewoa_batch` advance R independent runs together as an
+(R, pop, dim) tensor. Each run draws its initial population and every move
+from its own Generator, so run r depends only on its seed, not on R or the
+other runs. Each step takes one block of random numbers per run (not the
+per-whale draw order of `run_woa` / `run_ewoa`). A vectorized objective
+scores all R * pop whales in one call.
+"""
+
+from __future__ import annotations
+
+import time
+import numpy as np
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .adaptive import a_linear
+from .algorithms import _apply_moves, _compute_a, _record_moves
+from .fitness import evaluate_population
+from .metrics import RunHistory
+from .obl import opposite
+from .utils import SeedLike, ensure_bounds, initialize_population, spawn_rngs
+
+
+def _run_rngs(runs: int, seed: SeedLike, seeds: Optional[Sequence[SeedLike]]) -> List[np.random.Generator]:
+    if seeds is None:
+        return spawn_rngs(seed, runs)
+    if len(seeds) != runs:
+        raise ValueError(f"Expected {runs} seeds, got {len(seeds)}")
+    return [np.random.default_rng(s) for s in seeds]
+
+
+def _evaluate_runs(pops: np.ndarray, objective: Callable, executor: Optional[Executor], histories) -> np.ndarray:
+    # (R, n, dim) -> (R, n) with a single evaluate_population call; each run is
+    # charged its n evaluations and an equal share of the objective time
+    R, n, dim = pops.shape
+    start = time.perf_counter()
+    fit = evaluate_population(pops.reshape(R * n, dim), objective, executor).reshape(R, n)
+    share = (time.perf_counter() - start) / R
+    for h in histories:
+        h.evaluations += n
+        h.eval_seconds += share
+    return fit
+
+
+def _step(population, best_pos, a_vals, rngs, histories) -> np.ndarray:
+    # One WOA move for all runs; each run draws its r, p, l block and its
+    # random-whale indices from its own Generator
+    R, pop_size, _ = population.shape
+    u = np.stack([rng.random((pop_size, 3)) for rng in rngs])
+    rand_idx = np.stack([rng.integers(pop_size, size=pop_size) for rng in rngs])
+    a = np.asarray(a_vals, dtype=float)[:, None, None]
+    r, p = u[..., 0:1], u[..., 1:2]
+    l = 2.0 * u[..., 2:3] - 1.0
+    A = 2 * a * r - a
+    C = 2 * r
+    Xrand = population[np.arange(R)[:, None], rand_idx]
+    new_population, explore = _apply_moves(population, best_pos[:, None, :], A, C, p, l, Xrand)
+    for h, exp_ct in zip(histories, explore.sum(axis=1)):
+        _record_moves(h, int(exp_ct), pop_size - int(exp_ct))
+    return new_population
+
+
+def _update_best(population, fitness, best_pos, best_fit) -> None:
+    rows = np.arange(population.shape[0])
+    cur = np.argmin(fitness, axis=1)
+    improved = fitness[rows, cur] < best_fit
+    best_fit[improved] = fitness[rows, cur][improved]
+    best_pos[improved] = population[rows, cur][improved]
+
+
+def _diversities(population: np.ndarray) -> np.ndarray:
+    # population_diversity for every run at once
+    if population.shape[1] <= 1:
+        return np.zeros(population.shape[0])
+    return np.mean(np.std(population, axis=1), axis=1)
+
+
+def _finish(histories) -> None:
+    # Batch runs have no early stopping and always run every iteration
+    for h in histories:
+        h.stop_reason = "max_iters"
+
+
+def _record_iter(histories, diversity, best_fit, elapsed_ms, pop_size) -> None:
+    for r, h in enumerate(histories):
+        h.pop_size_per_iter.append(pop_size)
+        h.best_fitness_per_iter.append(float(best_fit[r]))
+        h.times_ms_per_iter.append(elapsed_ms)
+        h.diversity_per_iter.append(float(diversity[r]))
+
+
+def run_woa_batch(
+    objective: Callable[[np.ndarray], float],
+    dim: int,
+    bounds: Tuple[np.ndarray, np.ndarray],
+    runs: int = 30,
+    pop_size: int = 30,
+    iters: int = 100,
+    seed: SeedLike = None,
+    seeds: Optional[Sequence[SeedLike]] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[np.ndarray, np.ndarray, List[RunHistory]]:
+    """
+    R independent WOA runs. Run r draws everything from `seeds[r]`, or from
+    child r of `SeedSequence(seed)` (see `utils.spawn_seeds`). Returns
+    best positions (R, dim), best fitness (R,) and one RunHistory per run;
+    iteration times are the batch wall time divided by R.
+    """
+    rngs = _run_rngs(runs, seed, seeds)
+    lower, upper = bounds
+
+    histories = [RunHistory() for _ in range(runs)]
+    population = np.stack([initialize_population(pop_size, dim, bounds, rng) for rng in rngs])
+    fitness = _evaluate_runs(population, objective, executor, histories)
+
+    rows = np.arange(runs)
+    best_idx = np.argmin(fitness, axis=1)
+    best_pos = population[rows, best_idx].copy()
+    best_fit = fitness[rows, best_idx].astype(float)
+
+    for t in range(1, iters + 1):
+        start = time.time()
+        a = a_linear(t, iters)
+        population = _step(population, best_pos, [a] * runs, rngs, histories)
+        population = ensure_bounds(population, lower, upper)
+
+        fitness = _evaluate_runs(population, objective, executor, histories)
+        _update_best(population, fitness, best_pos, best_fit)
+        _record_iter(histories, _diversities(population), best_fit, (time.time() - start) * 1000.0 / runs, pop_size)
+
+    _finish(histories)
+    return best_pos, best_fit, histories
+
+
+def run_ewoa_batch(
+    objective: Callable[[np.ndarray], float],
+    dim: int,
+    bounds: Tuple[np.ndarray, np.ndarray],
+    runs: int = 30,
+    pop_size: int = 30,
+    iters: int = 100,
+    a_strategy: str = "sin",
+    diversity_aware: bool = True,
+    adaptive_a: bool = True,
+    use_obl: bool = True,
+    obl_freq: int = 1,
+    obl_rate: float = 1.0,
+    seed: SeedLike = None,
+    seeds: Optional[Sequence[SeedLike]] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[np.ndarray, np.ndarray, List[RunHistory]]:
+    """R independent EWOA runs; see `run_woa_batch` for seeding and return values."""
+    rngs = _run_rngs(runs, seed, seeds)
+    lower, upper = bounds
+
+    histories = [RunHistory() for _ in range(runs)]
+    population = np.stack([initialize_population(pop_size, dim, bounds, rng) for rng in rngs])
+    fitness = _evaluate_runs(population, objective, executor, histories)
+
+    if use_obl:
+        population_opp = ensure_bounds(opposite(population, bounds), lower, upper)
+        fitness_opp = _evaluate_runs(population_opp, objective, executor, histories)
+        better = fitness_opp < fitness
+        population = np.where(better[..., None], population_opp, population)
+        fitness = np.where(better, fitness_opp, fitness)
+
+    rows = np.arange(runs)
+    best_idx = np.argmin(fitness, axis=1)
+    best_pos = population[rows, best_idx].copy()
+    best_fit = fitness[rows, best_idx].astype(float)
+
+    diversity = _diversities(population)
+
+    for t in range(1, iters + 1):
+        start = time.time()
+        a_vals = [_compute_a(a_strategy, t, iters, d, diversity_aware, adaptive_a) for d in diversity]
+        new_population = _step(population, best_pos, a_vals, rngs, histories)
+        new_population = ensure_bounds(new_population, lower, upper)
+
+        fitness = _evaluate_runs(new_population, objective, executor, histories)
+
+        if use_obl and (obl_freq > 0) and (t % obl_freq == 0):
+            # Apply OBL to a fraction of each run's population; only the
+            # opposite points need scoring
+            count = max(1, int(pop_size * obl_rate))
+            idx = np.stack([rng.permutation(pop_size)[:count] for rng in rngs])
+            sel = new_population[rows[:, None], idx]
+            opp = ensure_bounds(opposite(sel, bounds), lower, upper)
+            fit_opp_sel = _evaluate_runs(opp, objective, executor, histories)
+            # selective replacement
+            r_i, c_i = np.nonzero(fit_opp_sel < fitness[rows[:, None], idx])
+            new_population[r_i, idx[r_i, c_i]] = opp[r_i, c_i]
+            fitness[r_i, idx[r_i, c_i]] = fit_opp_sel[r_i, c_i]
+
+        population = new_population
+
+        _update_best(population, fitness, best_pos, best_fit)
+        diversity = _diversities(population)
+        _record_iter(histories, diversity, best_fit, (time.time() - start) * 1000.0 / runs, pop_size)
+
+    _finish(histories)
+    return best_pos, best_fit, histories
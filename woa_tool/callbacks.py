@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional, Sequence
+
+# A callback receives one IterationEvent per optimizer iteration; returning a
+# truthy value asks the optimizer to stop after that iteration.
+Callback = Callable[["IterationEvent"], Optional[bool]]
+
+
+@dataclass
+class IterationEvent:
+    algo: str
+    t: int
+    iters: int
+    best_fitness: float
+    diversity: float
+    a: float
+    evaluations: int
+    eval_ms: float
+    update_ms: float
+    # Cumulative counts when the objective is a CachedObjective, else None
+    cache_hits: Optional[int] = None
+    cache_misses: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def notify(callbacks: Optional[Sequence[Callback]], event: IterationEvent) -> bool:
+    """Send `event` to every callback; True if any of them requested a stop."""
+    stop = False
+    for cb in callbacks or ():
+        if cb(event):
+            stop = True
+    return stop
+
+
+def close_all(callbacks: Optional[Sequence[Callback]]) -> None:
+    for cb in callbacks or ():
+        close = getattr(cb, "close", None)
+        if close is not None:
+            close()
+
+
+class ProgressBar:
+    """tqdm progress bar over optimizer iterations showing best fitness, diversity and evaluations."""
+
+    def __init__(self, desc: Optional[str] = None, leave: bool = True):
+        self.desc = desc
+        self.leave = leave
+        self._bar = None
+
+    def __call__(self, event: IterationEvent) -> None:
+        if self._bar is None:
+            from tqdm import tqdm
+            self._bar = tqdm(total=event.iters, initial=event.t - 1, desc=self.desc or event.algo.upper(), leave=self.leave)
+        self._bar.set_postfix(best=f"{event.best_fitness:.4f}", div=f"{event.diversity:.3f}", evals=event.evaluations, refresh=False)
+        self._bar.update(event.t - self._bar.n)
+
+    def close(self) -> None:
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+
+
+class JsonlWriter:
+    """Append each iteration event to `path` as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+
+    def __call__(self, event: IterationEvent) -> None:
+        if self._fh is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fh = open(self.path, "a")
+        self._fh.write(json.dumps(event.to_dict()) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import numpy as np
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from .metrics import RunHistory
+
+
+class Checkpointer:
+    """
+    Periodic optimizer checkpoints in a single compressed `.npz` file.
+
+    A checkpoint holds the population, its fitness, the best whale, the last
+    completed iteration, the Generator state, the partial RunHistory, the
+    wall time the run has used so far (so `max_time` spans restarts) and,
+    when a `CachedObjective` is attached, the fitness-cache contents. Files
+    are written to a temporary name and renamed, so an interrupted save never
+    leaves a truncated checkpoint behind.
+    """
+
+    def __init__(self, path: str, every: int = 10, cache=None):
+        self.path = path
+        self.every = int(every)
+        self.cache = cache
+
+    def due(self, t: int) -> bool:
+        return self.every > 0 and t % self.every == 0
+
+    def save(
+        self,
+        t: int,
+        population: np.ndarray,
+        fitness: np.ndarray,
+        best_pos: np.ndarray,
+        best_fit: float,
+        rng: np.random.Generator,
+        history: RunHistory,
+        done: bool = False,
+        elapsed: float = 0.0,
+    ) -> None:
+        arrays: Dict[str, Any] = {
+            "t": np.array(t),
+            "done": np.array(done),
+            "elapsed": np.array(float(elapsed)),
+            "population": population,
+            "fitness": fitness,
+            "best_pos": best_pos,
+            "best_fit": np.array(best_fit),
+            "rng_state": np.array(json.dumps(rng.bit_generator.state)),
+            "history": np.array(json.dumps(asdict(history))),
+        }
+        if self.cache is not None:
+            arrays["cache_keys"], arrays["cache_values"] = self.cache.dump()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the checkpoint (None if there is none) and refill the attached cache."""
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            state = {
+                "t": int(data["t"]),
+                "done": bool(data["done"]),
+                "elapsed": float(data["elapsed"]) if "elapsed" in data else 0.0,
+                "population": data["population"],
+                "fitness": data["fitness"],
+                "best_pos": data["best_pos"],
+                "best_fit": float(data["best_fit"]),
+                "rng_state": json.loads(str(data["rng_state"])),
+                "history": RunHistory(**json.loads(str(data["history"]))),
+            }
+            if self.cache is not None and "cache_keys" in data:
+                self.cache.load(data["cache_keys"], data["cache_values"])
+        return state
+
+    def restore(self, pop_size: int, dim: int, rng: np.random.Generator) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint for an optimizer run, check its shape and restore `rng`."""
+        state = self.load()
+        if state is None:
+            return None
+        rows, cols = state["population"].shape
+        # A population schedule may have shrunk the population below pop_size
+        if cols != dim or rows > pop_size:
+            raise ValueError(
+                f"Checkpoint {self.path} holds a population of shape {state['population'].shape}, "
+                f"expected at most {pop_size} whales of dimension {dim}"
+            )
+        rng.bit_generator.state = state["rng_state"]
+        return state
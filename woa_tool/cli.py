@@ -5,6 +5,7 @@ import sys
 import woa_tool.preprocess as preprocess
 import woa_tool.train as train
 import woa_tool.predict as predict
+import woa_tool.sweep as sweep
 
 
 def main():
@@ -16,6 +17,9 @@ def main():
     # preprocess
     # --------------------------
     prep_parser = subparsers.add_parser("preprocess", help="Extract image features and save processed numpy arrays")
+    prep_parser.add_argument("--workers", type=int, default=1, help="Parallel feature-extraction processes (1 = serial, 0 = all cores)")
+    prep_parser.add_argument("--no-cache", action="store_true", help="Extract every image instead of reusing the on-disk feature cache")
+    prep_parser.add_argument("--rebuild", action="store_true", help="Discard the incremental feature store and process every row again")
 
     # --------------------------
     # train
@@ -30,6 +34,49 @@ def main():
     train_parser.add_argument("--a-strategy", choices=["linear", "sin", "cos", "log", "tan", "square"], default="linear")
     train_parser.add_argument("--obl-freq", type=int, default=0, help="OBL frequency (0 = disabled)")
     train_parser.add_argument("--obl-rate", type=float, default=0.0, help="OBL rate (0.0 = disabled)")
+    train_parser.add_argument("--workers", type=int, default=1, help="Parallel fitness workers (1 = serial, 0 = all cores)")
+    train_parser.add_argument("--cache-size", type=int, default=50000, help="Fitness cache capacity in feature subsets (0 = disabled)")
+    train_parser.add_argument("--islands", type=int, default=0, help="EWOA islands run in separate processes (0 = single population; --pop is per island)")
+    train_parser.add_argument("--migrate-every", type=int, default=10, help="Iterations between island migrations")
+    train_parser.add_argument("--max-evals", type=int, default=None, help="Stop the optimizer after this many objective evaluations")
+    train_parser.add_argument("--max-time", type=float, default=None, help="Stop the optimizer after this many seconds")
+    train_parser.add_argument("--patience", type=int, default=None, help="Stop when the best fitness has not improved by more than --tol in this many iterations")
+    train_parser.add_argument("--tol", type=float, default=0.0, help="Minimum improvement that resets --patience")
+    train_parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    train_parser.add_argument("--checkpoint", default=None, help="Save optimizer state to this .npz file while training")
+    train_parser.add_argument("--checkpoint-every", type=int, default=10, help="Iterations between checkpoints")
+    train_parser.add_argument("--resume", action="store_true", help="Continue from the --checkpoint file instead of starting over")
+    train_parser.add_argument("--progress", action="store_true", help="Show a progress bar during the optimizer phase")
+    train_parser.add_argument("--log-jsonl", default=None, help="Append per-iteration optimizer events to this JSONL file")
+    train_parser.add_argument("--surrogate", choices=["ridge", "knn"], default=None,
+                              help="Pre-screen candidate subsets with a surrogate model; only the most promising get the true CV objective")
+    train_parser.add_argument("--surrogate-keep", type=float, default=0.3, help="Fraction of new subsets (best predicted) scored with the true objective")
+    train_parser.add_argument("--surrogate-explore", type=float, default=0.1, help="Extra fraction of new subsets, drawn at random, scored with the true objective")
+    train_parser.add_argument("--fidelity", type=lambda s: [int(v) for v in s.split(",") if v], default=None,
+                              help="Comma-separated fold counts for successive halving, e.g. 1,2 (full CV always runs last)")
+    train_parser.add_argument("--fidelity-keep", type=float, default=0.5, help="Fraction of candidates kept after each partial-CV rung")
+    train_parser.add_argument("--warm-start", default=None, help="Seed part of the initial population from this previous model JSON (aligned on feature names)")
+    train_parser.add_argument("--warm-population", default=None, help="Previous run's --checkpoint file; its best whales seed the population (requires --warm-start)")
+    train_parser.add_argument("--warm-fraction", type=float, default=0.5, help="Fraction of the initial population seeded by --warm-start")
+    train_parser.add_argument("--pop-schedule", choices=["linear", "diversity"], default=None,
+                              help="EWOA only: shrink the population over the run (linearly or as diversity drops), dropping the worst whales")
+    train_parser.add_argument("--min-pop", type=int, default=4, help="Smallest population size reached by --pop-schedule")
+    train_parser.add_argument("--finetune", choices=["first", "best"], default="first",
+                              help="Greedy fine-tuning: accept the first improving flip, or the best flip per batched round")
+    train_parser.add_argument("--exact-flips", action="store_true", help="Score greedy flips with full objective calls instead of incremental inverse updates")
+
+    # --------------------------
+    # sweep
+    # --------------------------
+    sweep_parser = subparsers.add_parser("sweep", help="Run a hyperparameter sweep over train settings")
+    sweep_parser.add_argument("--processed", required=True, help="Path to processed directory (e.g., data/processed)")
+    sweep_parser.add_argument("--space", required=True, help="JSON search space: train parameter -> list of values (or {low, high} for random)")
+    sweep_parser.add_argument("--mode", choices=["grid", "random"], default="grid", help="Grid or random search")
+    sweep_parser.add_argument("--samples", type=int, default=20, help="Configurations drawn in random mode")
+    sweep_parser.add_argument("--jobs", type=int, default=1, help="Configurations trained in parallel")
+    sweep_parser.add_argument("--store", default="sweeps/results.jsonl", help="JSONL result store; configurations already in it are skipped")
+    sweep_parser.add_argument("--models-dir", default="sweeps/models", help="Directory for the trained model JSON files")
+    sweep_parser.add_argument("--seed", type=int, default=None, help="Seed for drawing random configurations")
 
     # --------------------------
     # predict
@@ -37,6 +84,7 @@ def main():
     pred_parser = subparsers.add_parser("predict", help="Predict class for a new image")
     pred_parser.add_argument("--model", required=True, help="Path to trained model JSON")
     pred_parser.add_argument("--image", required=True, help="Path to image file")
+    pred_parser.add_argument("--no-cache", action="store_true", help="Extract features instead of using the on-disk feature cache")
 
     args = parser.parse_args()
 
@@ -44,7 +92,7 @@ def main():
     # Dispatch
     # --------------------------
     if args.command == "preprocess":
-        preprocess.run()
+        preprocess.run(workers=args.workers, use_cache=not args.no_cache, rebuild=args.rebuild)
 
     elif args.command == "train":
         train.train(
@@ -57,11 +105,49 @@ def main():
             a_strategy=args.a_strategy,
             obl_freq=args.obl_freq,
             obl_rate=args.obl_rate,
+            workers=args.workers,
+            cache_size=args.cache_size,
+            exact_flips=args.exact_flips,
+            finetune=args.finetune,
+            islands=args.islands,
+            migrate_every=args.migrate_every,
+            seed=args.seed,
+            max_evals=args.max_evals,
+            max_time=args.max_time,
+            patience=args.patience,
+            tol=args.tol,
+            checkpoint=args.checkpoint,
+            checkpoint_every=args.checkpoint_every,
+            resume=args.resume,
+            progress=args.progress,
+            log_jsonl=args.log_jsonl,
+            surrogate=args.surrogate,
+            surrogate_keep=args.surrogate_keep,
+            surrogate_explore=args.surrogate_explore,
+            fidelity=args.fidelity,
+            fidelity_keep=args.fidelity_keep,
+            warm_start=args.warm_start,
+            warm_population=args.warm_population,
+            warm_fraction=args.warm_fraction,
+            pop_schedule=args.pop_schedule,
+            min_pop=args.min_pop,
+        )
+
+    elif args.command == "sweep":
+        sweep.sweep(
+            processed_dir=args.processed,
+            space=sweep.load_space(args.space),
+            mode=args.mode,
+            samples=args.samples,
+            jobs=args.jobs,
+            store=args.store,
+            models_dir=args.models_dir,
+            seed=args.seed,
         )
 
     elif args.command == "predict":
         import json
-        result = predict.predict(args.model, args.image)
+        result = predict.predict(args.model, args.image, use_cache=not args.no_cache)
         print(json.dumps(result, indent=2))
 
 
@@ -1,5 +1,5 @@
 import os, time, json, numpy as np
-from woa_tool.feature_extraction import extract_image_features
+from woa_tool.feature_cache import cached_extract
 from evaluate_error_rate import maha_distance, zscore_normalize
 
 
@@ -11,14 +11,14 @@ def load_model(path):
         return json.load(f)
 
 
-def predict_single(image_path, model):
+def predict_single(image_path, model, use_cache=True):
     """Run one model (WOA or EWOA) on a single image and return results."""
     t0 = time.time()
 
-    # === Load and prepare ===
-    feats = extract_image_features(image_path)
+    # === Load and prepare (only the selected features are extracted) ===
     feature_names = model["feature_names"]
     selected_idx = model.get("selected_idx", list(range(len(feature_names))))
+    feats = cached_extract(image_path, use_cache, [feature_names[i] for i in selected_idx])
     global_mu = np.array(model["global_mu"], dtype=float)
     global_sigma = np.array(model["global_sigma"], dtype=float)
 
@@ -67,7 +67,7 @@ def predict_single(image_path, model):
     }
 
 
-def compare_models(image_path, ewoa_model, woa_model):
+def compare_models(image_path, ewoa_model, woa_model, use_cache=True):
     """Compare EWOA and WOA models on a single image."""
     start_total = time.time()
 
@@ -76,8 +76,8 @@ def compare_models(image_path, ewoa_model, woa_model):
     mW = load_model(woa_model)
 
     # Predict with each model
-    resultE = predict_single(image_path, mE)
-    resultW = predict_single(image_path, mW)
+    resultE = predict_single(image_path, mE, use_cache)
+    resultW = predict_single(image_path, mW, use_cache)
 
     total_time = time.time() - start_total
 
@@ -98,10 +98,11 @@ if __name__ == "__main__":
     parser.add_argument("--image", required=True, help="Path to the image (TIFF/JPG/PNG)")
     parser.add_argument("--ewoa", required=True, help="EWOA model path")
     parser.add_argument("--woa", required=True, help="WOA model path")
+    parser.add_argument("--no-cache", action="store_true", help="Always extract features instead of using the on-disk feature cache")
     args = parser.parse_args()
 
     try:
-        compare_models(args.image, args.ewoa, args.woa)
+        compare_models(args.image, args.ewoa, args.woa, use_cache=not args.no_cache)
     except Exception as e:
         # print clean error to stderr
         print(f"❌ Error: {str(e)}", file=sys.stderr)
@@ -0,0 +1,158 @@
+"""
+Persistent, content-addressed cache of extracted image features.
+
+Entries live in a SQLite file and are keyed by the SHA-256 of the image
+bytes plus a fingerprint of the extractor version and parameters, so a
+renamed or re-submitted image hits the cache while a changed extractor
+misses it. Partial extractions (see `extract_image_features(required=...)`)
+are stored under the same key suffixed with their feature groups, and a
+full entry for the image answers any partial request. The cache holds at most `max_entries` images; when it grows
+past that, the least recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from .feature_extraction import (
+    EXTRACTOR_PARAMS,
+    EXTRACTOR_VERSION,
+    FEATURE_GROUPS,
+    extract_image_features,
+    required_groups,
+)
+
+DEFAULT_CACHE_PATH = os.environ.get("WOA_FEATURE_CACHE", "data/cache/features.sqlite")
+
+
+def extractor_fingerprint() -> str:
+    # Library versions are included since they can shift feature values too
+    import mahotas
+    import skimage
+    payload = json.dumps({
+        "version": EXTRACTOR_VERSION,
+        "params": EXTRACTOR_PARAMS,
+        "skimage": skimage.__version__,
+        "mahotas": mahotas.__version__,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class FeatureCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 100000):
+        self.path = path
+        self.max_entries = int(max_entries)
+        self.fingerprint = extractor_fingerprint()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Several preprocess/predict processes may share the file
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS features (key TEXT PRIMARY KEY, feats TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS features_last_used ON features (last_used)")
+        self._db.commit()
+
+    def key(self, image_path: str) -> str:
+        return f"{file_digest(image_path)}:{self.fingerprint}"
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        row = self._db.execute("SELECT feats FROM features WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute("UPDATE features SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+        # JSON keeps the feature order and round-trips floats exactly
+        return json.loads(row[0])
+
+    def put(self, key: str, feats: Dict[str, float]) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO features (key, feats, last_used) VALUES (?, ?, ?)",
+            (key, json.dumps(feats), time.time()),
+        )
+        self._db.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM features").fetchone()
+        if count <= self.max_entries:
+            return
+        # Drop an extra 10% so eviction does not run on every insert once full
+        excess = count - self.max_entries + self.max_entries // 10
+        self._db.execute(
+            "DELETE FROM features WHERE key IN (SELECT key FROM features ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def lookup(self, image_path: str, required: Optional[Iterable[str]] = None) -> Tuple[str, Optional[Dict[str, float]]]:
+        """Cache key for this extraction and its cached features (None on a miss)."""
+        key = self.key(image_path)
+        feats = self.get(key)
+        if feats is not None:
+            return key, feats
+        groups = required_groups(required)
+        if len(groups) < len(FEATURE_GROUPS):
+            key = f"{key}:{'+'.join(groups)}"
+            feats = self.get(key)
+        return key, feats
+
+    def extract(self, image_path: str, required: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """`extract_image_features`, answered from the cache when the image was seen before."""
+        key, feats = self.lookup(image_path, required)
+        if feats is None:
+            feats = extract_image_features(image_path, required)
+            self.put(key, feats)
+        return feats
+
+
+def cached_extract(
+    image_path: str, use_cache: bool = True, required: Optional[Iterable[str]] = None
+) -> Dict[str, float]:
+    """
+    Extract features through the default on-disk cache (or directly with `use_cache=False`).
+
+    The cache is best effort: if it cannot be opened, read or written (read-only
+    working directory, locked database, ...), features are extracted directly.
+    """
+    if not use_cache:
+        return extract_image_features(image_path, required)
+    cache, key, feats = None, None, None
+    try:
+        cache = FeatureCache()
+        key, feats = cache.lookup(image_path, required)
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Feature cache unavailable ({e}); extracting without it", file=sys.stderr)
+        key = None
+    if feats is None:
+        feats = extract_image_features(image_path, required)
+        if key is not None:
+            try:
+                cache.put(key, feats)
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ Could not write to the feature cache ({e})", file=sys.stderr)
+    if cache is not None:
+        try:
+            cache.close()
+        except sqlite3.Error:
+            pass
+    return feats
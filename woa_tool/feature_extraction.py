@@ -17,18 +17,50 @@ No metadata is read here; this is purely image-derived.
 from __future__ import annotations
 import numpy as np
 import mahotas
-from typing import Dict, Tuple
+from functools import cached_property
+from typing import Dict, Iterable, Optional, Tuple
 from skimage import io, color, exposure, morphology, measure, util
 from skimage.filters import sobel, laplace, threshold_otsu
 from skimage.feature import canny, blob_log, structure_tensor
 from skimage.transform import resize
 from scipy.stats import skew, kurtosis
 
+# Bump EXTRACTOR_VERSION whenever feature values change; together with
+# EXTRACTOR_PARAMS it keys the on-disk feature cache (see feature_cache.py).
+EXTRACTOR_VERSION = 1
+DOWNSCALE_MAX = 1024
+CLAHE_CLIP_LIMIT = 0.02
+EXTRACTOR_PARAMS = {"downscale_max": DOWNSCALE_MAX, "clahe_clip_limit": CLAHE_CLIP_LIMIT}
+
+_HARALICK_NAMES = [
+    "ASM", "contrast", "correlation", "variance",
+    "IDM", "sum_avg", "sum_var", "sum_entropy",
+    "entropy", "diff_var", "diff_entropy",
+    "IMC1", "IMC2"
+]
+
+# Feature groups in extraction order, with the features each one produces
+FEATURE_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "glcm": tuple(f"glcm_{n}" for n in _HARALICK_NAMES),
+    "histogram": ("hist_mean", "hist_std", "hist_skew", "hist_kurtosis",
+                  "hist_q25", "hist_q50", "hist_q75", "density_index"),
+    "edge": ("edge_sobel_mean", "edge_sobel_std", "edge_ratio",
+             "grad_coherence_mean", "grad_coherence_std"),
+    "sharpness": ("sharp_lap_var",),
+    "blob": ("blob_count", "blob_density", "blob_radius_mean", "blob_radius_std"),
+    "asymmetry": ("asym_absdiff_mean", "asym_absdiff_std", "asym_mean_diff"),
+    "shape": ("shape_area", "shape_perimeter", "shape_circularity", "shape_eccentricity",
+              "shape_solidity", "shape_extent", "spic_edge_ring_ratio", "spic_orient_dispersion"),
+    "spic_edge_density": ("spic_edge_density",),
+    "glcm_direction_var": ("glcm_direction_var",),
+    "shape_norm_area": ("shape_norm_area",),
+}
+
 # -------------------------------------------------------------------------
 # Utility helpers
 # -------------------------------------------------------------------------
 
-def _safe_load_grayscale(path: str, downscale_max: int = 1024) -> np.ndarray:
+def _safe_load_grayscale(path: str, downscale_max: int = DOWNSCALE_MAX) -> np.ndarray:
     """
     Load image, drop alpha if RGBA, convert to grayscale float32 in [0,1].
     Optionally downscale largest side to `downscale_max` to speed up ops.
@@ -67,21 +99,78 @@ def _quantiles(a: np.ndarray, qs=(25, 50, 75)) -> Tuple[float, ...]:
         return tuple(0.0 for _ in qs)
 
 
+# -------------------------------------------------------------------------
+# Shared intermediates
+# -------------------------------------------------------------------------
+
+class _Intermediates:
+    """
+    Expensive per-image arrays shared by the feature groups.
+
+    Each one is computed on first use and then reused, so the Sobel map, the
+    Haralick matrix, the Otsu ROI region and its boundary ring are built at
+    most once per image. If a computation raises, every user sees the same
+    exception, as with separate computations.
+    """
+
+    def __init__(self, img: np.ndarray):
+        self.img = img
+        self._coherence: Dict[float, np.ndarray] = {}
+
+    @cached_property
+    def haralick(self) -> np.ndarray:
+        # 13 Haralick metrics for each of the 4 directions
+        im8 = (self.img * 255).astype(np.uint8)
+        return mahotas.features.haralick(im8, distance=1, ignore_zeros=False)
+
+    @cached_property
+    def sobel(self) -> np.ndarray:
+        return sobel(self.img)
+
+    @cached_property
+    def largest_region(self):
+        """Largest connected Otsu foreground region (small objects removed), or None."""
+        thr = threshold_otsu(self.img)
+        mask = self.img > thr
+        mask = morphology.remove_small_objects(mask, min_size=500)
+        labeled = measure.label(mask)
+        regions = measure.regionprops(labeled)
+        if not regions:
+            return None
+        return max(regions, key=lambda x: x.area)
+
+    @cached_property
+    def boundary_ring(self) -> Optional[np.ndarray]:
+        """Dilated boundary band of `largest_region` in image coordinates, or None."""
+        r = self.largest_region
+        if r is None:
+            return None
+        boundary = morphology.binary_dilation(r.image) ^ morphology.binary_erosion(r.image)
+        ring = np.zeros(self.img.shape, dtype=bool)
+        minr, minc, maxr, maxc = r.bbox
+        ring[minr:maxr, minc:maxc] = boundary
+        return morphology.binary_dilation(ring, morphology.disk(3))
+
+    def coherence(self, sigma: float) -> np.ndarray:
+        """Structure-tensor coherence (l1 - l2) / (l1 + l2) at scale `sigma`."""
+        if sigma not in self._coherence:
+            # Manual eigenvalue computation (replacement for removed structure_tensor_eigvals)
+            Axx, Axy, Ayy = structure_tensor(self.img, sigma=sigma)
+            tmp = np.sqrt((Axx - Ayy) ** 2 + 4 * Axy ** 2)
+            l1 = 0.5 * (Axx + Ayy + tmp)
+            l2 = 0.5 * (Axx + Ayy - tmp)
+            self._coherence[sigma] = (l1 - l2) / (l1 + l2 + 1e-8)
+        return self._coherence[sigma]
+
+
 # -------------------------------------------------------------------------
 # Feature groups
 # -------------------------------------------------------------------------
 
-def _glcm_features(img: np.ndarray) -> dict[str, float]:
-    im8 = (img * 255).astype(np.uint8)
+def _glcm_features(ctx: _Intermediates) -> dict[str, float]:
     # Haralick features (13 metrics averaged over 4 directions)
-    feats = mahotas.features.haralick(im8, distance=1, ignore_zeros=False).mean(axis=0)
-    names = [
-        "ASM", "contrast", "correlation", "variance",
-        "IDM", "sum_avg", "sum_var", "sum_entropy",
-        "entropy", "diff_var", "diff_entropy",
-        "IMC1", "IMC2"
-    ]
-    return {f"glcm_{n}": float(v) for n, v in zip(names, feats)}
+    feats = ctx.haralick.mean(axis=0)
+    return {f"glcm_{n}": float(v) for n, v in zip(_HARALICK_NAMES, feats)}
 
 
 def _histogram_features(img: np.ndarray) -> Dict[str, float]:
@@ -104,8 +193,9 @@ def _histogram_features(img: np.ndarray) -> Dict[str, float]:
     }
 
 
-def _edge_gradient_features(img: np.ndarray) -> Dict[str, float]:
-    sob = sobel(img)
+def _edge_gradient_features(ctx: _Intermediates) -> Dict[str, float]:
+    img = ctx.img
+    sob = ctx.sobel
     sob_mean = _nan_safe(sob.mean())
     sob_std  = _nan_safe(sob.std())
 
@@ -113,13 +203,7 @@ def _edge_gradient_features(img: np.ndarray) -> Dict[str, float]:
     can = canny(img, sigma=sigma)
     edge_ratio = float(can.mean())
 
-    # Manual eigenvalue computation (replacement for removed structure_tensor_eigvals)
-    Axx, Axy, Ayy = structure_tensor(img, sigma=1.0)
-    tmp = np.sqrt((Axx - Ayy) ** 2 + 4 * Axy ** 2)
-    l1 = 0.5 * (Axx + Ayy + tmp)
-    l2 = 0.5 * (Axx + Ayy - tmp)
-
-    coherence = (l1 - l2) / (l1 + l2 + 1e-8)
+    coherence = ctx.coherence(1.0)
     coh_mean = _nan_safe(np.nanmean(coherence))
     coh_std  = _nan_safe(np.nanstd(coherence))
 
@@ -171,7 +255,7 @@ def _asymmetry_features(img: np.ndarray) -> Dict[str, float]:
     }
 
 
-def _shape_and_spiculation_features(img: np.ndarray) -> Dict[str, float]:
+def _shape_and_spiculation_features(ctx: _Intermediates) -> Dict[str, float]:
     feats = {
         "shape_area": 0.0, "shape_perimeter": 0.0,
         "shape_circularity": 0.0, "shape_eccentricity": 0.0,
@@ -180,16 +264,10 @@ def _shape_and_spiculation_features(img: np.ndarray) -> Dict[str, float]:
     }
 
     try:
-        thr = threshold_otsu(img)
-        mask = img > thr
-        mask = morphology.remove_small_objects(mask, min_size=500)
-        labeled = measure.label(mask)
-        regions = measure.regionprops(labeled)
-
-        if not regions:
+        r = ctx.largest_region
+        if r is None:
             return feats
 
-        r = max(regions, key=lambda x: x.area)
         feats["shape_area"] = float(r.area)
         feats["shape_perimeter"] = float(r.perimeter)
         if r.perimeter > 0 and r.area > 0:
@@ -198,22 +276,14 @@ def _shape_and_spiculation_features(img: np.ndarray) -> Dict[str, float]:
         feats["shape_solidity"] = float(getattr(r, "solidity", 0.0))
         feats["shape_extent"] = float(getattr(r, "extent", 0.0))
 
-        boundary = morphology.binary_dilation(r.image) ^ morphology.binary_erosion(r.image)
-        ring = np.zeros_like(mask, dtype=bool)
-        minr, minc, maxr, maxc = r.bbox
-        ring[minr:maxr, minc:maxc] = boundary
-        ring = morphology.binary_dilation(ring, morphology.disk(3))
+        ring = ctx.boundary_ring
 
-        sob = sobel(img)
+        sob = ctx.sobel
         edge_bin = sob > (sob.mean() + sob.std())
         if ring.sum() > 50:
             feats["spic_edge_ring_ratio"] = float(edge_bin[ring].mean())
 
-        Axx, Axy, Ayy = structure_tensor(img, sigma=1.2)
-        tmp = np.sqrt((Axx - Ayy) ** 2 + 4 * Axy ** 2)
-        l1 = 0.5 * (Axx + Ayy + tmp)
-        l2 = 0.5 * (Axx + Ayy - tmp)
-        coherence = (l1 - l2) / (l1 + l2 + 1e-8)
+        coherence = ctx.coherence(1.2)
         ring_coh = coherence[ring] if ring.any() else coherence
         feats["spic_orient_dispersion"] = _nan_safe(np.nanstd(ring_coh))
     except Exception:
@@ -226,16 +296,29 @@ def _shape_and_spiculation_features(img: np.ndarray) -> Dict[str, float]:
 # Main API
 # -------------------------------------------------------------------------
 
-def extract_image_features(image_path: str) -> Dict[str, float]:
+def required_groups(required: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """Feature groups needed to produce `required` (all groups for None); unknown names are ignored."""
+    if required is None:
+        return tuple(FEATURE_GROUPS)
+    required = set(required)
+    return tuple(g for g, names in FEATURE_GROUPS.items() if required.intersection(names))
+
+
+def extract_image_features(image_path: str, required: Optional[Iterable[str]] = None) -> Dict[str, float]:
     """
     Enhanced image feature extraction for mammograms.
     Includes adaptive contrast normalization, ROI masking, and normalized features.
+
+    With `required`, only the feature groups (and shared intermediates) that
+    produce those names are run; the result holds every feature of those
+    groups and nothing else.
     """
 
+    groups = set(required_groups(required))
     img = _safe_load_grayscale(image_path)
 
     # === 1. Adaptive contrast normalization (CLAHE) ===
-    img = exposure.equalize_adapthist(img, clip_limit=0.02)
+    img = exposure.equalize_adapthist(img, clip_limit=CLAHE_CLIP_LIMIT)
 
     # === 2. ROI masking using Otsu threshold (ignore dark background) ===
     try:
@@ -247,51 +330,53 @@ def extract_image_features(image_path: str) -> Dict[str, float]:
         pass
 
     feats = {}
+    ctx = _Intermediates(img)
 
     # === 3. Core radiomic features ===
-    feats.update(_glcm_features(img))
-    feats.update(_histogram_features(img))
-    feats.update(_edge_gradient_features(img))
-    feats.update(_sharpness_features(img))
-    feats.update(_blob_calcification_features(img))
-    feats.update(_asymmetry_features(img))
-    feats.update(_shape_and_spiculation_features(img))
+    if "glcm" in groups:
+        feats.update(_glcm_features(ctx))
+    if "histogram" in groups:
+        feats.update(_histogram_features(img))
+    if "edge" in groups:
+        feats.update(_edge_gradient_features(ctx))
+    if "sharpness" in groups:
+        feats.update(_sharpness_features(img))
+    if "blob" in groups:
+        feats.update(_blob_calcification_features(img))
+    if "asymmetry" in groups:
+        feats.update(_asymmetry_features(img))
+    if "shape" in groups:
+        feats.update(_shape_and_spiculation_features(ctx))
 
     # === 4. Extra spiculation metric (edge density near boundary) ===
-    try:
-        sob = sobel(img)
-        thr = threshold_otsu(img)
-        mask = img > thr
-        mask = morphology.remove_small_objects(mask, min_size=500)
-        labeled = measure.label(mask)
-        regions = measure.regionprops(labeled)
-        if regions:
-            r = max(regions, key=lambda x: x.area)
-            boundary = morphology.binary_dilation(r.image) ^ morphology.binary_erosion(r.image)
-            ring = np.zeros_like(mask, dtype=bool)
-            minr, minc, maxr, maxc = r.bbox
-            ring[minr:maxr, minc:maxc] = boundary
-            ring = morphology.binary_dilation(ring, morphology.disk(3))
-            if ring.sum() > 50:
-                feats["spic_edge_density"] = float(np.mean(sob[ring]))
-    except Exception:
-        feats["spic_edge_density"] = 0.0
+    if "spic_edge_density" in groups:
+        try:
+            sob = ctx.sobel
+            if ctx.largest_region is not None:
+                ring = ctx.boundary_ring
+                if ring.sum() > 50:
+                    feats["spic_edge_density"] = float(np.mean(sob[ring]))
+        except Exception:
+            feats["spic_edge_density"] = 0.0
 
     # === 5. Directional GLCM variance (texture consistency across directions) ===
-    try:
-        im8 = (img * 255).astype(np.uint8)
-        glcm_all = mahotas.features.haralick(im8, distance=1, ignore_zeros=False)
-        feats["glcm_direction_var"] = float(np.var(glcm_all, axis=0).mean())
-    except Exception:
-        feats["glcm_direction_var"] = 0.0
+    if "glcm_direction_var" in groups:
+        try:
+            feats["glcm_direction_var"] = float(np.var(ctx.haralick, axis=0).mean())
+        except Exception:
+            feats["glcm_direction_var"] = 0.0
 
     # === 6. Shape normalization (relative to total image area) ===
-    try:
-        h, w = img.shape[:2]
-        area = float(h * w)
-        feats["shape_norm_area"] = feats.get("shape_area", 0.0) / (area + 1e-6)
-    except Exception:
-        feats["shape_norm_area"] = 0.0
+    # Same value as shape_area / image area, without running the shape group
+    if "shape_norm_area" in groups:
+        try:
+            h, w = img.shape[:2]
+            area = float(h * w)
+            r = ctx.largest_region
+            shape_area = float(r.area) if r is not None else 0.0
+            feats["shape_norm_area"] = shape_area / (area + 1e-6)
+        except Exception:
+            feats["shape_norm_area"] = 0.0
 
     # === 8. NaN/Inf guard ===
     for k, v in list(feats.items()):
@@ -0,0 +1,132 @@
+"""
+Append-only, chunked store of extracted feature rows for incremental preprocessing.
+
+Each batch of rows is written as one `chunk_NNNNN.npz` file and then
+committed by appending a line to `manifest.jsonl` that lists, per row, the
+`patient_id`, image path, modification time and size. A chunk without a
+manifest line (e.g. after a crash) is ignored and later overwritten, so the
+store is always consistent. A row whose image changed on disk no longer
+matches its manifest entry and is extracted again; the newest entry wins.
+The store is tied to the extractor fingerprint and starts over when it changes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .feature_cache import extractor_fingerprint
+
+
+def _atomic_write(path: str, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _stat(path: str) -> Tuple[float, int]:
+    st = os.stat(path)
+    return st.st_mtime, st.st_size
+
+
+class FeatureStore:
+    def __init__(self, root: str, fingerprint: Optional[str] = None):
+        self.root = root
+        self.fingerprint = fingerprint or extractor_fingerprint()
+        self.manifest_path = os.path.join(root, "manifest.jsonl")
+        self.meta_path = os.path.join(root, "meta.json")
+        os.makedirs(root, exist_ok=True)
+
+        meta = {}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+            if meta.get("fingerprint") != self.fingerprint:
+                print(f"⚠️ Feature extractor changed since {root} was built; starting a new store")
+                self.clear()
+                meta = {}
+        self.feature_names: Optional[List[str]] = meta.get("feature_names")
+
+        self._index: Dict[Tuple[str, str], Tuple[str, int, float, int]] = {}
+        self._chunks: Dict[str, np.ndarray] = {}
+        self._n_chunks = 0
+        self._read_manifest()
+
+    def _read_manifest(self) -> None:
+        if not os.path.exists(self.manifest_path):
+            return
+        good = 0
+        with open(self.manifest_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write from an interrupted run
+                if not line.endswith(b"\n"):
+                    break
+                good += len(line)
+                for j, r in enumerate(entry["rows"]):
+                    self._index[(r["patient_id"], r["path"])] = (entry["chunk"], j, r["mtime"], r["size"])
+                self._n_chunks += 1
+        if good < os.path.getsize(self.manifest_path):
+            with open(self.manifest_path, "r+b") as f:
+                f.truncate(good)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root)
+        os.makedirs(self.root, exist_ok=True)
+        self.feature_names = None
+        self._index, self._chunks, self._n_chunks = {}, {}, 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, patient_id, path: str) -> Optional[np.ndarray]:
+        """Stored feature row for this image, or None if missing or the file changed since."""
+        entry = self._index.get((str(patient_id), path))
+        if entry is None:
+            return None
+        chunk, row, mtime, size = entry
+        if _stat(path) != (mtime, size):
+            return None
+        if chunk not in self._chunks:
+            with np.load(os.path.join(self.root, chunk)) as data:
+                self._chunks[chunk] = data["X"]
+        return self._chunks[chunk][row]
+
+    def append(self, patient_ids: Sequence, paths: Sequence[str], X: np.ndarray, feature_names: List[str]) -> None:
+        if self.feature_names is None:
+            self.feature_names = list(feature_names)
+            meta = {"fingerprint": self.fingerprint, "feature_names": self.feature_names}
+            _atomic_write(self.meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode()))
+        elif list(feature_names) != self.feature_names:
+            raise ValueError(f"Feature names differ from those already in {self.root}")
+
+        chunk = f"chunk_{self._n_chunks:05d}.npz"
+        X = np.asarray(X, dtype=float)
+        _atomic_write(os.path.join(self.root, chunk), lambda f: np.savez(f, X=X))
+
+        rows = []
+        for pid, path in zip(patient_ids, paths):
+            mtime, size = _stat(path)
+            rows.append({"patient_id": str(pid), "path": path, "mtime": mtime, "size": size})
+        # The manifest line commits the chunk
+        with open(self.manifest_path, "a") as f:
+            f.write(json.dumps({"chunk": chunk, "rows": rows}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        for j, r in enumerate(rows):
+            self._index[(r["patient_id"], r["path"])] = (chunk, j, r["mtime"], r["size"])
+        self._chunks[chunk] = X
+        self._n_chunks += 1
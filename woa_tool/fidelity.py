@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import math
+import numpy as np
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Sequence
+
+from .fitness import CachedObjective, binary_mask_key
+from .parallel import executor_chunksize
+
+
+class MultiFidelityObjective:
+    """
+    Successive halving over cross-validation folds.
+
+    `objective` must expose `n_folds`, `fold_errors(mask, folds)` (per-fold
+    scores) and return the mean over all folds when called, like
+    `SubsetObjective`. A population is scored in rungs: rung i runs folds
+    `levels[i-1]:levels[i]` for the candidates still alive, then keeps the
+    `keep` fraction with the best partial mean, plus any candidate whose
+    partial mean could still beat the best full-CV score seen. Survivors of
+    the last rung get their full-CV mean, identical to `objective(mask)`;
+    pruned candidates keep their partial mean, which is always worse than the
+    best full score, so the optimizer's best is always a full-CV number.
+
+    With `cache`, full-CV scores are looked up in and written to that
+    `CachedObjective`; partial scores are never cached.
+    """
+
+    vectorized = True
+
+    def __init__(
+        self,
+        objective,
+        levels: Sequence[int] = (1, 2),
+        keep: float = 0.5,
+        cache: Optional[CachedObjective] = None,
+        executor: Optional[Executor] = None,
+    ):
+        n_folds = int(objective.n_folds)
+        levels = sorted({int(l) for l in levels if 0 < int(l) < n_folds})
+        self.levels = levels + [n_folds]
+        self.keep = float(keep)
+        self.objective = objective
+        self.cache = cache
+        self.executor = executor
+        self._best_full = np.inf
+
+        self.candidates = 0
+        self.full_evals = 0
+        self.pruned = 0
+        self.fold_evals = 0
+
+    def _fold_errors(self, masks: np.ndarray, folds: List[int]) -> np.ndarray:
+        self.fold_evals += len(masks) * len(folds)
+        if self.executor is not None:
+            chunksize = executor_chunksize(self.executor, len(masks))
+            rows = self.executor.map(self.objective.fold_errors, masks, [folds] * len(masks), chunksize=chunksize)
+            return np.array(list(rows), dtype=float).reshape(len(masks), len(folds))
+        return np.array([self.objective.fold_errors(m, folds) for m in masks], dtype=float).reshape(len(masks), len(folds))
+
+    def __call__(self, x: np.ndarray):
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 1:
+            return float(self._evaluate(x[None, :])[0])
+        return self._evaluate(x)
+
+    def _evaluate(self, pop: np.ndarray) -> np.ndarray:
+        fit = np.empty(pop.shape[0], dtype=float)
+        pending: Dict[bytes, List[int]] = {}
+        for i, ind in enumerate(pop):
+            val = self.cache.lookup(ind) if self.cache is not None else None
+            if val is not None:
+                fit[i] = val
+            else:
+                pending.setdefault(binary_mask_key(ind), []).append(i)
+        if not pending:
+            return fit
+
+        groups = list(pending.values())
+        masks = pop[[idx[0] for idx in groups]]
+        self.candidates += len(groups)
+        scores: List[List[np.ndarray]] = [[] for _ in groups]
+        alive = np.arange(len(groups))
+        start = 0
+        for rung, stop in enumerate(self.levels):
+            errs = self._fold_errors(masks[alive], list(range(start, stop)))
+            for j, row in zip(alive, errs):
+                scores[j].append(row)
+            start = stop
+            partial = np.array([np.mean(np.concatenate(scores[j])) for j in alive])
+            if rung == len(self.levels) - 1:
+                break
+            n_keep = max(1, int(math.ceil(self.keep * len(alive))))
+            survive = np.zeros(len(alive), dtype=bool)
+            survive[np.argsort(partial, kind="stable")[:n_keep]] = True
+            survive |= partial <= self._best_full
+            for j, val in zip(alive[~survive], partial[~survive]):
+                fit[groups[j]] = val
+            self.pruned += int((~survive).sum())
+            alive = alive[survive]
+
+        for j, val in zip(alive, partial):
+            val = float(val)
+            fit[groups[j]] = val
+            if self.cache is not None:
+                self.cache.store(masks[j], val)
+            self._best_full = min(self._best_full, val)
+        self.full_evals += len(alive)
+        return fit
+
+    def stats(self) -> dict:
+        """How much of the full-CV work was done: full evaluations, pruned candidates, fold fraction."""
+        n_folds = self.levels[-1]
+        return {
+            "levels": self.levels,
+            "keep": self.keep,
+            "candidates": self.candidates,
+            "full_evals": self.full_evals,
+            "pruned": self.pruned,
+            "fold_fraction": self.fold_evals / float(self.candidates * n_folds) if self.candidates else 0.0,
+        }
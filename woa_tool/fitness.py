@@ -1,9 +1,184 @@
 from __future__ import annotations
 
 import numpy as np
-from typing import Callable
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Hashable, Optional, Tuple
 
+from .parallel import executor_chunksize
 
-def evaluate_population(pop: np.ndarray, objective: Callable[[np.ndarray], float]) -> np.ndarray:
+
+def vectorized(func: Callable[[np.ndarray], np.ndarray]) -> Callable[[np.ndarray], np.ndarray]:
+    """Mark an objective as taking a ``(pop, dim)`` matrix and returning a fitness vector."""
+    func.vectorized = True
+    return func
+
+
+class BatchObjective:
+    """Wrap a batch fitness function so it can also be called on a single individual.
+
+    ``evaluate_population`` passes the whole population to ``batch_fn`` in one call;
+    calling the wrapper with a 1-D vector scores it as a population of one.
+    """
+
+    vectorized = True
+
+    def __init__(self, batch_fn: Callable[[np.ndarray], np.ndarray]):
+        self.batch_fn = batch_fn
+
+    def __call__(self, x: np.ndarray):
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 1:
+            return float(self.batch_fn(x[None, :])[0])
+        return np.asarray(self.batch_fn(x), dtype=float)
+
+
+def is_vectorized(objective: Callable) -> bool:
+    return bool(getattr(objective, "vectorized", False))
+
+
+def evaluate_population(
+    pop: np.ndarray,
+    objective: Callable[[np.ndarray], float],
+    executor: Optional[Executor] = None,
+) -> np.ndarray:
+    """
+    Score every row of `pop`. Vectorized objectives get the whole matrix in
+    one call; otherwise rows are scored one by one, spread over `executor`
+    when given (the objective must then be picklable).
+    """
+    pop = np.atleast_2d(pop)
+    if pop.shape[0] == 0:
+        return np.empty(0, dtype=float)
+    if is_vectorized(objective):
+        fit = np.asarray(objective(pop), dtype=float).reshape(-1)
+        if fit.shape[0] != pop.shape[0]:
+            raise ValueError(
+                f"Vectorized objective returned {fit.shape[0]} values for {pop.shape[0]} individuals"
+            )
+        return fit
+    if executor is not None:
+        chunksize = executor_chunksize(executor, pop.shape[0])
+        return np.fromiter(executor.map(objective, pop, chunksize=chunksize), dtype=float, count=pop.shape[0])
     return np.array([objective(ind) for ind in pop], dtype=float)
 
+
+def find_objective(objective: Optional[Callable], cls: type):
+    """
+    First `cls` instance found walking inward through objective wrappers, or
+    None. Each wrapper is entered through the `.cache` it scores through when
+    that is a `cls`, otherwise through its `.objective`.
+    """
+    while objective is not None and not isinstance(objective, cls):
+        cache = getattr(objective, "cache", None)
+        objective = cache if isinstance(cache, cls) else getattr(objective, "objective", None)
+    return objective
+
+
+def binary_mask_key(x: np.ndarray, threshold: float = 0.5) -> bytes:
+    """Bit-packed key of the subset selected by `x > threshold`."""
+    return np.packbits(np.asarray(x) > threshold).tobytes()
+
+
+class CachedObjective:
+    """
+    Bounded LRU memo around an objective, keyed by `key_fn(individual)`.
+
+    Distinct positions that map to the same key (e.g. the same binarized
+    feature subset) are scored once. With a vectorized inner objective or an
+    `executor`, the wrapper is itself vectorized: a population is looked up,
+    de-duplicated, and only the misses are sent to `evaluate_population`.
+    """
+
+    def __init__(
+        self,
+        objective: Callable[[np.ndarray], float],
+        key_fn: Callable[[np.ndarray], Hashable] = binary_mask_key,
+        capacity: int = 50000,
+        executor: Optional[Executor] = None,
+    ):
+        self.objective = objective
+        self.key_fn = key_fn
+        self.capacity = int(capacity)
+        self.executor = executor
+        self.vectorized = is_vectorized(objective) or executor is not None
+        self._store: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def _get(self, key: Hashable) -> Optional[float]:
+        val = self._store.get(key)
+        if val is not None:
+            self._store.move_to_end(key)
+        return val
+
+    def _put(self, key: Hashable, val: float) -> None:
+        if self.capacity <= 0:
+            return
+        self._store[key] = val
+        self._store.move_to_end(key)
+        while len(self._store) > self.capacity:
+            self._store.popitem(last=False)
+
+    def __call__(self, x: np.ndarray):
+        x = np.asarray(x)
+        if x.ndim == 1:
+            return float(self._evaluate(x[None, :])[0])
+        return self._evaluate(x)
+
+    def _evaluate(self, pop: np.ndarray) -> np.ndarray:
+        keys = [self.key_fn(ind) for ind in pop]
+        fit = np.empty(len(keys), dtype=float)
+        pending: "OrderedDict[Hashable, list]" = OrderedDict()
+        for i, k in enumerate(keys):
+            val = self._get(k)
+            if val is not None:
+                fit[i] = val
+                self.hits += 1
+            elif k in pending:
+                pending[k].append(i)
+                self.hits += 1
+            else:
+                pending[k] = [i]
+                self.misses += 1
+        if pending:
+            rows = [idx[0] for idx in pending.values()]
+            vals = evaluate_population(pop[rows], self.objective, self.executor)
+            for (k, idx), v in zip(pending.items(), vals):
+                fit[idx] = v
+                self._put(k, float(v))
+        return fit
+
+    def lookup(self, x: np.ndarray) -> Optional[float]:
+        """Cached fitness of `x`, or None (counted as a miss; call `store` once it is scored)."""
+        val = self._get(self.key_fn(x))
+        if val is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return val
+
+    def store(self, x: np.ndarray, val: float) -> None:
+        self._put(self.key_fn(x), float(val))
+
+    def dump(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Cache contents as (keys, values) arrays, LRU order first; keys must be equal-length bytes."""
+        keys = list(self._store.keys())
+        lengths = {len(k) for k in keys if isinstance(k, bytes)}
+        if len(lengths) > 1 or (keys and not all(isinstance(k, bytes) for k in keys)):
+            raise ValueError("Only caches with equal-length bytes keys can be dumped")
+        width = lengths.pop() if lengths else 0
+        key_arr = np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(len(keys), width)
+        return key_arr, np.array(list(self._store.values()), dtype=float)
+
+    def load(self, keys: np.ndarray, values: np.ndarray) -> None:
+        for k, v in zip(keys, values):
+            self._put(k.tobytes(), float(v))
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / float(total) if total else 0.0
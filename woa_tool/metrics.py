@@ -15,6 +15,13 @@ class RunHistory:
     exploitation_count_per_iter: list = field(default_factory=list)
     # Average population diversity per iteration (if provided by the algorithm loop)
     diversity_per_iter: list = field(default_factory=list)
+    # Whales evaluated per iteration (changes under an EWOA population schedule)
+    pop_size_per_iter: list = field(default_factory=list)
+    # Objective evaluations requested by the optimizer and why the run ended
+    evaluations: int = 0
+    stop_reason: str = "max_iters"
+    # Wall time spent inside objective evaluations
+    eval_seconds: float = 0.0
 
     @property
     def exploration_ratio(self) -> float:
@@ -31,6 +38,39 @@ class RunHistory:
         return curve
 
 
+def merge_histories(histories: List[RunHistory]) -> RunHistory:
+    # Combine histories of populations that ran side by side (e.g. EWOA islands):
+    # best fitness is the minimum over populations, step and evaluation counts are
+    # summed, iteration time is the slowest population and diversity is averaged.
+    # Populations that stopped early keep their final best and contribute no steps.
+    merged = RunHistory()
+    if not histories:
+        return merged
+    n = max(len(h.best_fitness_per_iter) for h in histories)
+
+    def at(values, i, pad):
+        return values[i] if i < len(values) else pad
+
+    for i in range(n):
+        merged.best_fitness_per_iter.append(float(min(
+            at(h.best_fitness_per_iter, i, h.best_fitness_per_iter[-1] if h.best_fitness_per_iter else float("inf"))
+            for h in histories
+        )))
+        merged.times_ms_per_iter.append(float(max(at(h.times_ms_per_iter, i, 0.0) for h in histories)))
+        merged.exploration_count_per_iter.append(int(sum(at(h.exploration_count_per_iter, i, 0) for h in histories)))
+        merged.exploitation_count_per_iter.append(int(sum(at(h.exploitation_count_per_iter, i, 0) for h in histories)))
+        merged.pop_size_per_iter.append(int(sum(at(h.pop_size_per_iter, i, 0) for h in histories)))
+        divs = [h.diversity_per_iter[i] for h in histories if i < len(h.diversity_per_iter)]
+        if divs:
+            merged.diversity_per_iter.append(float(np.mean(divs)))
+    merged.exploration_steps = int(sum(h.exploration_steps for h in histories))
+    merged.exploitation_steps = int(sum(h.exploitation_steps for h in histories))
+    merged.evaluations = int(sum(h.evaluations for h in histories))
+    merged.eval_seconds = float(sum(h.eval_seconds for h in histories))
+    merged.stop_reason = ",".join(sorted({h.stop_reason for h in histories}))
+    return merged
+
+
 def summarize_eer_over_runs(histories: List[RunHistory], interval: int = 5) -> Dict[str, List[float]]:
     # Average EER across runs, optionally summarized by intervals of iterations
     if not histories:
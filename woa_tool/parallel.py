@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+# Per-process cache of attached segments, so a handle unpickled for every
+# task chunk maps the block only once per worker.
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+class SharedArray:
+    """
+    A read-only NumPy array backed by `multiprocessing.shared_memory`.
+
+    Pickling sends only the segment name, shape and dtype; worker processes
+    attach to the existing block instead of receiving a copy of the data.
+    The creating process owns the segment and must call `release()`.
+    """
+
+    def __init__(self, arr: np.ndarray):
+        arr = np.ascontiguousarray(arr)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+        self.name = self._shm.name
+        self.shape = arr.shape
+        self.dtype = arr.dtype
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        self.array[...] = arr
+        self.array.flags.writeable = False
+        self._owner = True
+
+    def __getstate__(self):
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype.str}
+
+    def __setstate__(self, state):
+        self.name = state["name"]
+        self.shape = tuple(state["shape"])
+        self.dtype = np.dtype(state["dtype"])
+        self._owner = False
+        if self.name not in _ATTACHED:
+            shm = shared_memory.SharedMemory(name=self.name)
+            arr = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+            arr.flags.writeable = False
+            _ATTACHED[self.name] = (shm, arr)
+        self._shm, self.array = _ATTACHED[self.name]
+
+    def release(self) -> None:
+        if not self._owner:
+            return
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+        self._owner = False
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Normalize a worker count: None/1 -> serial, 0 or negative -> all cores."""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return int(workers)
+
+
+_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+
+
+def limit_worker_threads(threads: int = 1) -> None:
+    """
+    Pool initializer: cap BLAS/OpenMP threads in a worker so N workers do not
+    each start one thread per core. The environment covers libraries loaded
+    later; threadpoolctl (installed with scikit-learn) caps those already loaded.
+    """
+    for var in _THREAD_ENV:
+        os.environ[var] = str(threads)
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+
+class WorkerPool(ProcessPoolExecutor):
+    """A process pool that knows its resolved worker count (`workers`)."""
+
+    def __init__(self, workers: int, **kwargs):
+        super().__init__(max_workers=workers, **kwargs)
+        self.workers = int(workers)
+
+
+def default_chunksize(n_tasks: int, workers: int) -> int:
+    # About four chunks per worker: little IPC overhead, still balanced
+    return max(1, n_tasks // (4 * max(1, workers)))
+
+
+def executor_chunksize(executor: Executor, n_tasks: int) -> int:
+    """`default_chunksize` for a pool from `make_executor` (other executors count as one worker)."""
+    return default_chunksize(n_tasks, getattr(executor, "workers", 1))
+
+
+def make_executor(workers: Optional[int]) -> Optional[Executor]:
+    """Return a process pool for `workers` > 1, or None to evaluate serially."""
+    n = resolve_workers(workers)
+    if n <= 1:
+        return None
+    return WorkerPool(n)
@@ -1,11 +1,11 @@
 import os, json
 import numpy as np
 from typing import Dict, List
-from .feature_extraction import extract_image_features
-from .abnormality import infer_abnormality
+from .feature_cache import cached_extract
+from .abnormality import ABNORMALITY_INPUTS, infer_abnormality
 
 
-def predict(model_path: str, image_path: str) -> Dict:
+def predict(model_path: str, image_path: str, use_cache: bool = True) -> Dict:
     """Predict class and infer abnormality for a new mammogram image."""
 
     # === Load model ===
@@ -30,10 +30,11 @@ def predict(model_path: str, image_path: str) -> Dict:
     if not os.path.isfile(image_path):
         raise FileNotFoundError(f"❌ Image not found: {image_path}")
 
-    # === Extract features ===
-    feats_raw = extract_image_features(image_path)
-    x_full = np.array([feats_raw.get(f, 0.0) for f in feature_names], dtype=float)
+    # === Extract only the selected features and the abnormality inputs ===
     sel = np.array(selected_idx, dtype=int) if len(selected_idx) else np.arange(len(feature_names))
+    required = {feature_names[i] for i in sel} | set(ABNORMALITY_INPUTS)
+    feats_raw = cached_extract(image_path, use_cache, required)
+    x_full = np.array([feats_raw.get(f, 0.0) for f in feature_names], dtype=float)
     x = x_full[sel]
 
     # === Distance-based classifier (shared variance) ===
@@ -46,7 +47,7 @@ def predict(model_path: str, image_path: str) -> Dict:
 
     # === Compute z-scores ===
     zvec = (x_full - gmu) / (gsg + 1e-6)
-    z = {name: float(zvec[i]) for i, name in enumerate(feature_names)}
+    z = {name: float(zvec[i]) for i, name in enumerate(feature_names) if name in required}
 
     # === Infer abnormality and background ===
     abn_label, abn_scores, abn_expl, background = infer_abnormality(z)
@@ -2,7 +2,11 @@
 import os
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from .feature_extraction import extract_image_features
+from .feature_cache import FeatureCache
+from .feature_store import FeatureStore
+from .parallel import default_chunksize, limit_worker_threads, resolve_workers
 import json
 
 OUT_DIR = "data/processed"
@@ -33,11 +37,65 @@ def load_processed_data(processed_dir="data/processed"):
 
     return X, y, feature_names
 
-def load_dataset(csv_path):
+def _extract(img_path):
+    # Worker task: a failing image is reported instead of aborting the whole batch
+    try:
+        return extract_image_features(img_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _extract_all(paths, workers=1, chunksize=None, cache=None):
+    """
+    Features for each path in order; `workers` > 1 spreads images over a process pool.
+    With a `FeatureCache`, images seen before are answered from it and only the
+    rest are extracted (and then stored).
+    """
+    results = [None] * len(paths)
+    keys = [cache.key(p) for p in paths] if cache is not None else [None] * len(paths)
+    todo = []
+    for i, key in enumerate(keys):
+        feats = cache.get(key) if cache is not None else None
+        if feats is not None:
+            results[i] = (feats, None)
+        else:
+            todo.append(i)
+
+    n = resolve_workers(workers)
+    todo_paths = [paths[i] for i in todo]
+    if n <= 1 or len(todo) <= 1:
+        extracted = [_extract(p) for p in todo_paths]
+    else:
+        if chunksize is None:
+            chunksize = default_chunksize(len(todo), n)
+        with ProcessPoolExecutor(max_workers=n, initializer=limit_worker_threads) as pool:
+            # map() yields results in submission order, so output follows the manifest
+            extracted = list(pool.map(_extract, todo_paths, chunksize=chunksize))
+
+    for i, (feats, error) in zip(todo, extracted):
+        results[i] = (feats, error)
+        if cache is not None and feats is not None:
+            cache.put(keys[i], feats)
+    if cache is not None and paths:
+        print(f"🗃️ Feature cache: {len(paths) - len(todo)}/{len(paths)} images reused")
+    return results
+
+
+def load_dataset(csv_path, workers=1, chunksize=None, cache=None, store=None, chunk_rows=256, feature_names=None):
+    """
+    Feature matrix, labels and ids for the manifest at `csv_path`, in manifest order.
+
+    With a `FeatureStore`, rows whose image is unchanged since it was stored
+    are reused, and new or changed rows are extracted `chunk_rows` at a time
+    and appended to the store after each chunk, so an interrupted run resumes
+    where it stopped.
+    """
     df = pd.read_csv(csv_path)
     X, y, ids = [], [], []
-    feature_names = None
+    if feature_names is None and store is not None:
+        feature_names = store.feature_names
 
+    rows = []
     for _, row in df.iterrows():
         label = str(row["Class"]).strip()
         if label not in label_map:
@@ -47,30 +105,83 @@ def load_dataset(csv_path):
         if not os.path.exists(img_path):
             print(f"⚠️ Missing image: {img_path}")
             continue
-
-        feats = extract_image_features(img_path)
-        if feature_names is None:
-            feature_names = list(feats.keys())
-
-        X.append([feats[f] for f in feature_names])
-        y.append(label_map[label])
+        rows.append(row)
+
+    vectors = [None] * len(rows)
+    todo = []
+    for i, row in enumerate(rows):
+        vec = store.lookup(row["patient_id"], row["image_path"]) if store is not None else None
+        if vec is not None:
+            vectors[i] = vec
+        else:
+            todo.append(i)
+    if store is not None and rows:
+        print(f"🗂️ Feature store: {len(rows) - len(todo)}/{len(rows)} rows up to date, {len(todo)} to extract")
+
+    failed = 0
+    step = chunk_rows if store is not None else max(1, len(todo))
+    for start in range(0, len(todo), step):
+        batch = todo[start:start + step]
+        results = _extract_all([rows[i]["image_path"] for i in batch], workers, chunksize, cache)
+        done = []
+        for i, (feats, error) in zip(batch, results):
+            row = rows[i]
+            if feats is None:
+                failed += 1
+                print(f"❌ Feature extraction failed for {row['image_path']}: {error}")
+                continue
+            if feature_names is None:
+                feature_names = list(feats.keys())
+            missing = [f for f in feature_names if f not in feats]
+            if missing:
+                failed += 1
+                print(f"❌ Feature extraction failed for {row['image_path']}: missing {', '.join(missing)}")
+                continue
+            vectors[i] = [feats[f] for f in feature_names]
+            done.append(i)
+        if store is not None and done:
+            store.append(
+                [rows[i]["patient_id"] for i in done], [rows[i]["image_path"] for i in done],
+                np.array([vectors[i] for i in done], dtype=float), feature_names,
+            )
+            print(f"  💾 Stored {min(start + step, len(todo))}/{len(todo)} rows")
+
+    for row, vec in zip(rows, vectors):
+        if vec is None:
+            continue
+        X.append(vec)
+        y.append(label_map[str(row["Class"]).strip()])
         ids.append(row["patient_id"])
+    if failed:
+        print(f"⚠️ {failed} of {len(rows)} images failed and were skipped")
 
     return np.array(X, dtype=float), np.array(y, dtype=int), ids, feature_names
 
 
-def run():
-    print("🔄 Loading training set...")
-    X_train, y_train, ids_train, feat_names = load_dataset("data/train.csv")
-    np.save(os.path.join(OUT_DIR, "X_train.npy"), X_train)
-    np.save(os.path.join(OUT_DIR, "y_train.npy"), y_train)
-    np.save(os.path.join(OUT_DIR, "ids_train.npy"), np.array(ids_train))
-
-    print("🔄 Loading test set...")
-    X_test, y_test, ids_test, _ = load_dataset("data/test.csv")
-    np.save(os.path.join(OUT_DIR, "X_test.npy"), X_test)
-    np.save(os.path.join(OUT_DIR, "y_test.npy"), y_test)
-    np.save(os.path.join(OUT_DIR, "ids_test.npy"), np.array(ids_test))
+def run(workers=1, use_cache=True, rebuild=False):
+    cache = FeatureCache() if use_cache else None
+    # Per-split append-only stores make re-runs incremental and resumable
+    stores = {split: FeatureStore(os.path.join(OUT_DIR, "store", split)) for split in ("train", "test")}
+    if rebuild:
+        for store in stores.values():
+            store.clear()
+    try:
+        print("🔄 Loading training set...")
+        X_train, y_train, ids_train, feat_names = load_dataset(
+            "data/train.csv", workers=workers, cache=cache, store=stores["train"])
+        np.save(os.path.join(OUT_DIR, "X_train.npy"), X_train)
+        np.save(os.path.join(OUT_DIR, "y_train.npy"), y_train)
+        np.save(os.path.join(OUT_DIR, "ids_train.npy"), np.array(ids_train))
+
+        print("🔄 Loading test set...")
+        X_test, y_test, ids_test, _ = load_dataset(
+            "data/test.csv", workers=workers, cache=cache, store=stores["test"], feature_names=feat_names)
+        np.save(os.path.join(OUT_DIR, "X_test.npy"), X_test)
+        np.save(os.path.join(OUT_DIR, "y_test.npy"), y_test)
+        np.save(os.path.join(OUT_DIR, "ids_test.npy"), np.array(ids_test))
+    finally:
+        if cache is not None:
+            cache.close()
 
     with open(os.path.join(OUT_DIR, "feature_names.json"), "w") as f:
         json.dump(feat_names, f, indent=2)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import math
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
+
+from .fitness import evaluate_population
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(values), dtype=float)
+    ranks[np.argsort(values, kind="stable")] = np.arange(len(values))
+    return ranks
+
+
+def _rank_corr(pred: np.ndarray, true: np.ndarray) -> Optional[float]:
+    """Spearman correlation (ties broken by order); None when undefined."""
+    if len(pred) < 3:
+        return None
+    rp, rt = _ranks(pred), _ranks(true)
+    rp -= rp.mean()
+    rt -= rt.mean()
+    denom = math.sqrt(float(rp @ rp) * float(rt @ rt))
+    return float(rp @ rt) / denom if denom > 0 else None
+
+
+class SurrogateObjective:
+    """
+    Pre-screen feature subsets with a cheap model before paying for the objective.
+
+    Positions are binarized at `threshold`. The surrogate, a ridge regressor
+    (`model="ridge"`) or a Hamming k-nearest-neighbour average (`model="knn"`)
+    over the masks, is trained online on every true evaluation. For each
+    population only the `keep` fraction with the best predictions, plus an
+    `explore` fraction drawn at random from the rest, is scored with the true
+    objective; the others get their prediction, clipped to lie strictly above
+    the best true fitness seen, so an unevaluated subset never ties or beats
+    it. Until `warmup` true evaluations have been made every new subset is
+    scored for real. True scores of up to `capacity` subsets are remembered
+    (least recently used dropped first).
+
+    Calling the wrapper with a single 1-D vector always uses the true objective.
+    """
+
+    vectorized = True
+
+    def __init__(
+        self,
+        objective: Callable[[np.ndarray], float],
+        model: str = "ridge",
+        keep: float = 0.3,
+        explore: float = 0.1,
+        warmup: Optional[int] = None,
+        ridge: float = 1.0,
+        k: int = 5,
+        max_archive: int = 20000,
+        capacity: int = 50000,
+        threshold: float = 0.5,
+        seed=None,
+        executor: Optional[Executor] = None,
+    ):
+        if model not in ("ridge", "knn"):
+            raise ValueError(f"Unknown surrogate model: {model}")
+        self.objective = objective
+        self.model = model
+        self.keep = float(keep)
+        self.explore = float(explore)
+        self.warmup = warmup
+        self.ridge = float(ridge)
+        self.k = int(k)
+        self.max_archive = int(max_archive)
+        self.capacity = int(capacity)
+        self.threshold = threshold
+        self.rng = np.random.default_rng(seed)
+        self.executor = executor
+
+        self._known: "OrderedDict[bytes, float]" = OrderedDict()
+        self._best_true = np.inf
+        self._XtX: Optional[np.ndarray] = None
+        self._Xty: Optional[np.ndarray] = None
+        self._archive: List[np.ndarray] = []
+        self._archive_y: List[float] = []
+
+        self.true_evals = 0
+        self.predicted = 0
+        self._abs_err_sum = 0.0
+        self._scored = 0
+        self._rank_corrs: List[float] = []
+
+    # --- surrogate model -------------------------------------------------
+    def _design(self, bits: np.ndarray) -> np.ndarray:
+        return np.hstack([np.ones((bits.shape[0], 1)), bits])
+
+    def _fit(self, bits: np.ndarray, y: np.ndarray) -> None:
+        if self.model == "ridge":
+            X = self._design(bits)
+            if self._XtX is None:
+                self._XtX = np.zeros((X.shape[1], X.shape[1]))
+                self._Xty = np.zeros(X.shape[1])
+            self._XtX += X.T @ X
+            self._Xty += X.T @ y
+        else:
+            self._archive.extend(bits)
+            self._archive_y.extend(y.tolist())
+            if len(self._archive) > self.max_archive:
+                del self._archive[:-self.max_archive]
+                del self._archive_y[:-self.max_archive]
+
+    def _predict(self, bits: np.ndarray) -> np.ndarray:
+        if self._XtX is None and not self._archive:
+            return np.zeros(bits.shape[0])
+        if self.model == "ridge":
+            reg = self.ridge * np.eye(self._XtX.shape[0])
+            reg[0, 0] = 0.0  # leave the intercept unpenalized
+            w = np.linalg.solve(self._XtX + reg + 1e-9 * np.eye(reg.shape[0]), self._Xty)
+            return self._design(bits) @ w
+        A = np.asarray(self._archive)
+        # Hamming distance between 0/1 rows: |a| + |b| - 2 a.b
+        dist = bits.sum(axis=1)[:, None] + A.sum(axis=1)[None, :] - 2.0 * (bits @ A.T)
+        k = min(self.k, A.shape[0])
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        return np.asarray(self._archive_y)[nearest].mean(axis=1)
+
+    # --- evaluation ------------------------------------------------------
+    def __call__(self, x: np.ndarray):
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 1:
+            return float(evaluate_population(x[None, :], self.objective, self.executor)[0])
+        return self._evaluate(x)
+
+    def _evaluate(self, pop: np.ndarray) -> np.ndarray:
+        bits = (pop > self.threshold).astype(float)
+        keys = [np.packbits(b.astype(bool)).tobytes() for b in bits]
+        fit = np.empty(len(keys), dtype=float)
+
+        # Group rows by subset; subsets already scored for real are free
+        pending: Dict[bytes, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key in self._known:
+                fit[i] = self._known[key]
+                self._known.move_to_end(key)
+            else:
+                pending.setdefault(key, []).append(i)
+        if not pending:
+            return fit
+
+        groups = list(pending.values())
+        rows = np.array([idx[0] for idx in groups])
+        warmup = self.warmup if self.warmup is not None else 2 * (bits.shape[1] + 1)
+        if self.true_evals < warmup:
+            chosen = np.arange(len(rows))
+            pred = None
+        else:
+            pred = self._predict(bits[rows])
+            order = np.argsort(pred, kind="stable")
+            n_keep = min(len(order), max(1, int(math.ceil(self.keep * len(order)))))
+            rest = order[n_keep:]
+            n_explore = min(len(rest), int(round(self.explore * len(order))))
+            explore = self.rng.choice(rest, size=n_explore, replace=False) if n_explore else rest[:0]
+            chosen = np.concatenate([order[:n_keep], explore])
+
+        true_fit = evaluate_population(pop[rows[chosen]], self.objective, self.executor)
+        self.true_evals += len(chosen)
+        for j, v in zip(chosen, true_fit):
+            fit[groups[j]] = v
+            self._known[keys[rows[j]]] = float(v)
+            self._known.move_to_end(keys[rows[j]])
+        while len(self._known) > self.capacity:
+            self._known.popitem(last=False)
+        self._best_true = min(self._best_true, float(true_fit.min()))
+
+        # The empty subset carries a penalty score that would swamp the regression
+        nonempty = bits[rows[chosen]].any(axis=1)
+        if pred is not None:
+            err = np.abs(pred[chosen] - true_fit)[nonempty]
+            self._abs_err_sum += float(err.sum())
+            self._scored += len(err)
+            corr = _rank_corr(pred[chosen][nonempty], true_fit[nonempty])
+            if corr is not None:
+                self._rank_corrs.append(corr)
+            skipped = np.setdiff1d(np.arange(len(rows)), chosen)
+            self.predicted += len(skipped)
+            # Strictly worse than the best true score, so argmin never picks an unevaluated subset
+            floor = float(np.nextafter(self._best_true, np.inf))
+            for j in skipped:
+                fit[groups[j]] = max(float(pred[j]), floor)
+
+        if nonempty.any():
+            self._fit(bits[rows[chosen]][nonempty], true_fit[nonempty])
+        return fit
+
+    @property
+    def true_fraction(self) -> float:
+        total = self.true_evals + self.predicted
+        return self.true_evals / float(total) if total else 0.0
+
+    def stats(self) -> dict:
+        """True-evaluation fraction and surrogate accuracy on the subsets it was checked against."""
+        return {
+            "model": self.model,
+            "true_evals": self.true_evals,
+            "predicted": self.predicted,
+            "true_fraction": self.true_fraction,
+            "mae": self._abs_err_sum / self._scored if self._scored else None,
+            "rank_corr": float(np.mean(self._rank_corrs)) if self._rank_corrs else None,
+        }
@@ -0,0 +1,188 @@
+"""
+Hyperparameter sweeps over `train.train`.
+
+A search space is a JSON object mapping `train` keyword arguments to a list
+of values (grid and random search) or, for random search only, a
+`{"low": a, "high": b}` range (integers if both bounds are integers).
+Configurations run on a local process pool; the processed data is loaded
+once and handed to each worker when it starts. Every finished configuration
+is appended to a JSONL store, and configurations already in the store are
+skipped, so an interrupted sweep can simply be restarted. Keys include the
+processed-data directory and a digest of its files, so rebuilt or different
+data never reuses old results.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import os
+import time
+import traceback
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from . import train as train_mod
+from .feature_cache import file_digest
+from .preprocess import load_processed_data
+
+# Arguments the sweep itself controls
+_RESERVED = {"processed_dir", "out", "data", "checkpoint", "resume", "progress", "log_jsonl"}
+
+_DATA = None
+
+
+def load_space(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        space = json.load(f)
+    allowed = set(inspect.signature(train_mod.train).parameters) - _RESERVED
+    unknown = sorted(set(space) - allowed)
+    if unknown:
+        raise ValueError(f"Unknown train parameters in search space: {', '.join(unknown)}")
+    return space
+
+
+def grid_configs(space: Dict[str, Any]) -> List[Dict[str, Any]]:
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Grid search needs a list of values for '{name}'")
+    names = sorted(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[n] for n in names))]
+
+
+def random_configs(space: Dict[str, Any], samples: int, seed=None) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name in sorted(space):
+            values = space[name]
+            if isinstance(values, list):
+                config[name] = values[int(rng.integers(len(values)))]
+            elif isinstance(values.get("low"), int) and isinstance(values.get("high"), int):
+                config[name] = int(rng.integers(values["low"], values["high"] + 1))
+            else:
+                config[name] = float(rng.uniform(values["low"], values["high"]))
+        configs.append(config)
+    return configs
+
+
+def data_identity(processed_dir: str) -> str:
+    """The processed-data directory plus a digest of the files `train` reads from it."""
+    digests = [file_digest(os.path.join(processed_dir, name))
+               for name in ("X_train.npy", "y_train.npy", "feature_names.json")]
+    combined = hashlib.sha256("".join(digests).encode()).hexdigest()[:16]
+    return f"{os.path.abspath(processed_dir)}@{combined}"
+
+
+def config_key(config: Dict[str, Any], data_id: str) -> str:
+    return json.dumps({"config": config, "data": data_id}, sort_keys=True)
+
+
+def load_done(store: str) -> set:
+    """Keys of configurations that already have a successful record in `store`."""
+    done = set()
+    if not os.path.exists(store):
+        return done
+    with open(store, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("status") == "ok":
+                done.add(record["key"])
+    return done
+
+
+def _init_worker(data) -> None:
+    global _DATA
+    _DATA = data
+
+
+def _run_config(config: Dict[str, Any], processed_dir: str, out: str, key: str) -> Dict[str, Any]:
+    start = time.time()
+    record = {"key": key, "config": config, "model_path": out}
+    try:
+        # train() reports progress on stdout; keep worker output out of the sweep log
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = train_mod.train(processed_dir=processed_dir, out=out, data=_DATA, **config)
+        record.update(
+            status="ok",
+            cv_error=model["cv_error"],
+            cv_error_B=model["cv_error_B"],
+            cv_error_M=model["cv_error_M"],
+            selected=len(model["selected_idx"]),
+            iterations_run=model["iterations_run"],
+            evaluations=model["evaluations"],
+            stop_reason=model["stop_reason"],
+        )
+    except Exception:
+        record.update(status="error", error=traceback.format_exc())
+    record["runtime_s"] = time.time() - start
+    return record
+
+
+def sweep(
+    processed_dir: str = "data/processed",
+    space: Optional[Dict[str, Any]] = None,
+    mode: str = "grid",
+    samples: int = 20,
+    jobs: int = 1,
+    store: str = "sweeps/results.jsonl",
+    models_dir: str = "sweeps/models",
+    seed=None,
+) -> List[Dict[str, Any]]:
+    if mode == "grid":
+        configs = grid_configs(space or {})
+    else:
+        configs = random_configs(space or {}, samples, seed)
+
+    data = load_processed_data(processed_dir)
+    data_id = data_identity(processed_dir)
+    done = load_done(store)
+    todo, seen = [], set()
+    for config in configs:
+        key = config_key(config, data_id)
+        if key not in done and key not in seen:
+            seen.add(key)
+            todo.append(config)
+    print(f"🧪 Sweep: {len(configs)} configurations, {len(configs) - len(todo)} already done, {len(todo)} to run")
+    if not todo:
+        return []
+
+    os.makedirs(models_dir, exist_ok=True)
+    if os.path.dirname(store):
+        os.makedirs(os.path.dirname(store), exist_ok=True)
+
+    def model_path(key):
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        return os.path.join(models_dir, f"model_{digest}.json")
+
+    records = []
+    with ProcessPoolExecutor(max_workers=max(1, jobs), initializer=_init_worker, initargs=(data,)) as pool:
+        futures = []
+        for config in todo:
+            key = config_key(config, data_id)
+            futures.append(pool.submit(_run_config, config, processed_dir, model_path(key), key))
+        for i, fut in enumerate(as_completed(futures), 1):
+            record = fut.result()
+            with open(store, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            records.append(record)
+            if record["status"] == "ok":
+                print(f"  ✅ [{i}/{len(todo)}] {json.dumps(record['config'], sort_keys=True)} → CV {record['cv_error']:.4f} "
+                      f"({record['evaluations']} evals, {record['runtime_s']:.1f}s)")
+            else:
+                print(f"  ❌ [{i}/{len(todo)}] {json.dumps(record['config'], sort_keys=True)} failed:\n{record['error']}")
+
+    ok = [r for r in records if r["status"] == "ok"]
+    if ok:
+        best = min(ok, key=lambda r: r["cv_error"])
+        print(f"🏆 Best of this sweep: {json.dumps(best['config'], sort_keys=True)} → CV {best['cv_error']:.4f} ({best['model_path']})")
+    return records
@@ -1,7 +1,418 @@
-import os, json, numpy as np
+import os, json, time, numpy as np
 from sklearn.model_selection import StratifiedKFold
 from .preprocess import load_processed_data
-from .algorithms import run_ewoa, run_woa
+from .algorithms import run_ewoa, run_ewoa_islands, run_woa
+from .callbacks import JsonlWriter, ProgressBar
+from .checkpoint import Checkpointer
+from .fitness import CachedObjective, evaluate_population, find_objective, is_vectorized
+from .fidelity import MultiFidelityObjective
+from .surrogate import SurrogateObjective
+from .parallel import SharedArray, make_executor
+from .utils import spawn_rngs, spawn_seeds
+
+
+def _flip(mask, idx):
+    cand = mask.copy()
+    cand[list(idx)] = 1 - cand[list(idx)]
+    return cand
+
+
+def _greedy_pass(objective, best_mask, best_score, flips, executor, report, tol=0.0, evaluator=None):
+    """
+    First-improvement greedy search over `flips` (tuples of feature indices).
+    With an incremental `evaluator`, a vectorized objective or a worker pool,
+    all remaining candidates of the current mask are scored at once; after an
+    accepted flip the rest are rebuilt from the new mask, so the outcome
+    matches a sequential scan.
+    """
+    parallel = evaluator is not None or is_vectorized(objective) or executor is not None
+    chunk = len(flips) if parallel else 1
+    if evaluator is not None:
+        evaluator.rebase(best_mask)
+    start = 0
+    while start < len(flips):
+        batch = flips[start:start + chunk]
+        if evaluator is not None:
+            errs = evaluator.score(batch)
+        else:
+            errs = evaluate_population(np.array([_flip(best_mask, f) for f in batch]), objective, executor)
+        better = np.flatnonzero(errs < best_score - tol)
+        if better.size == 0:
+            start += len(batch)
+            continue
+        k = int(better[0])
+        best_mask, best_score = _flip(best_mask, batch[k]), float(errs[k])
+        report(batch[k], best_score)
+        if evaluator is not None:
+            evaluator.rebase(best_mask)
+        start += k + 1
+    return best_mask, best_score
+
+
+def _best_improvement_pass(objective, best_mask, best_score, flips, executor, report, tol=0.0, evaluator=None):
+    """
+    Best-improvement greedy search over `flips`: each round scores every flip
+    of the current mask as one batch (incremental evaluator, vectorized
+    objective or worker pool) and accepts the single best improvement.
+    Stops when a round finds none.
+    """
+    if not flips:  # e.g. pair flips with a single feature
+        return best_mask, best_score
+    rnd = 0
+    while True:
+        rnd += 1
+        t0 = time.time()
+        if evaluator is not None:
+            evaluator.rebase(best_mask)
+            errs = evaluator.score(flips)
+        else:
+            errs = evaluate_population(np.array([_flip(best_mask, f) for f in flips]), objective, executor)
+        k = int(np.argmin(errs))
+        improved = errs[k] < best_score - tol
+        print(f"  ⏱️ Round {rnd}: {len(flips)} candidates in {time.time() - t0:.2f}s")
+        if not improved:
+            return best_mask, best_score
+        best_mask, best_score = _flip(best_mask, flips[k]), float(errs[k])
+        report(flips[k], best_score)
+
+
+# ===============================================================
+#  Objective function (feature-subset fitness)
+# ===============================================================
+
+class FoldPlan:
+    """
+    Cross-validation folds plus per-fold class statistics on the full feature set.
+
+    Built once per training run. Class means and the pooled covariance of any
+    feature subset are slices of the full-feature arrays, so evaluations never
+    rebuild covariances. All arrays live in shared memory and the plan pickles
+    as a set of small handles.
+    """
+
+    def __init__(self, X, y, skf, ridge=1e-6):
+        n, k = X.shape
+        splits = list(skf.split(X, y))
+        fold_of = np.empty(n, dtype=np.int32)
+        means = np.empty((len(splits), 2, k))
+        pooled = np.empty((len(splits), k, k))
+
+        for f, (tr, va) in enumerate(splits):
+            fold_of[va] = f
+            Xtr, ytr = X[tr], y[tr]
+            means[f, 0] = Xtr[ytr == 0].mean(axis=0)
+            means[f, 1] = Xtr[ytr == 1].mean(axis=0)
+            Sb = np.atleast_2d(np.cov(Xtr[ytr == 0].T))
+            Sm = np.atleast_2d(np.cov(Xtr[ytr == 1].T))
+            pooled[f] = 0.5 * (Sb + Sm) + ridge * np.eye(k)
+
+        self.n_folds = len(splits)
+        self.n_features = k
+        self._X = SharedArray(X)
+        self._y = SharedArray(y)
+        self._fold_of = SharedArray(fold_of)
+        self._means = SharedArray(means)
+        self._pooled = SharedArray(pooled)
+        self._va = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_va"] = None
+        return state
+
+    @property
+    def X(self):
+        return self._X.array
+
+    @property
+    def y(self):
+        return self._y.array
+
+    def validation(self, f):
+        """Validation row indices of fold `f` (ascending, as StratifiedKFold yields them)."""
+        if self._va is None:
+            fold_of = self._fold_of.array
+            self._va = [np.flatnonzero(fold_of == i) for i in range(self.n_folds)]
+        return self._va[f]
+
+    def class_means(self, f, selected=None):
+        means = self._means.array[f]
+        if selected is None:
+            return means[0], means[1]
+        return means[0, selected], means[1, selected]
+
+    def pooled_cov(self, f, selected=None):
+        cov = self._pooled.array[f]
+        if selected is None:
+            return cov
+        return cov[np.ix_(selected, selected)]
+
+    def release(self):
+        for arr in (self._X, self._y, self._fold_of, self._means, self._pooled):
+            arr.release()
+
+
+def _distances(d2):
+    with np.errstate(invalid="ignore"):
+        return np.sqrt(d2)
+
+
+def _fold_errors(d_b, d_m, yva):
+    """
+    Weighted and per-class error of one validation fold at the best τ.
+    `d_b`/`d_m` may be (n,) for one subset or (n, m) for m candidate subsets,
+    in which case arrays of m errors are returned.
+    """
+    single = d_b.ndim == 1
+    with np.errstate(invalid="ignore"):
+        ratio = (d_m / (d_b + 1e-9)).reshape(len(yva), -1)
+
+    # === τ sweep (all thresholds scored together) ===
+    taus = np.array([0.90, 0.95, 0.98, 1.00, 1.02, 1.05, 1.08, 1.10, 1.12])
+    pred = (ratio[None, :, :] < taus[:, None, None]).astype(int)
+    wrong = pred != yva[None, :, None]
+    eB = wrong[:, yva == 0].sum(axis=1)
+    eM = wrong[:, yva == 1].sum(axis=1)
+    errB_all = eB / (np.sum(yva == 0) + 1e-6)
+    errM_all = eM / (np.sum(yva == 1) + 1e-6)
+    W_B, W_M = 1.0, 1.5
+    weighted = (W_B * errB_all + W_M * errM_all) / (W_B + W_M)
+
+    # === Final errors with best τ (first minimum, as in a sequential sweep) ===
+    best = np.argmin(weighted, axis=0)
+    cols = np.arange(weighted.shape[1])
+    errB, errM = errB_all[best, cols], errM_all[best, cols]
+    weighted_err = (1.0 * errB + 1.5 * errM) / 2.5
+    if single:
+        return float(weighted_err[0]), float(errB[0]), float(errM[0])
+    return weighted_err, errB, errM
+
+
+def _mask_position(mask, rng):
+    # A random position in (-1, 1) that binarizes (> 0.5) to `mask`
+    return np.where(mask, rng.uniform(0.5, 1.0, mask.size), rng.uniform(-1.0, 0.5, mask.size))
+
+
+def _warm_start_population(model_path, feature_names, pop, fraction, rng, population_path=None):
+    """
+    Initial whales carried over from a previous model, aligned on feature names.
+
+    Row 0 encodes the previous `selected_idx`. The other seeded rows are the
+    best whales of `population_path` (a `--checkpoint` file of the previous
+    run) when given, otherwise perturbations of the previous subset with one
+    to three flipped features. About `fraction` of the population is seeded;
+    the optimizer fills the rest at random.
+    """
+    with open(model_path, "r") as f:
+        prev = json.load(f)
+    prev_names = prev["feature_names"]
+    carried = {prev_names[i] for i in prev["selected_idx"]}
+    column = {name: i for i, name in enumerate(prev_names)}
+    known = np.array([j for j, name in enumerate(feature_names) if name in column], dtype=int)
+    base = np.array([name in carried for name in feature_names])
+    n_seed = min(pop, max(1, int(round(fraction * pop))))
+
+    rows = [_mask_position(base, rng)]
+    if population_path:
+        with np.load(population_path) as ck:
+            old_pop, old_fit = ck["population"], ck["fitness"]
+        if old_pop.shape[1] != len(prev_names):
+            raise ValueError(
+                f"{population_path} has {old_pop.shape[1]} columns but {model_path} lists {len(prev_names)} features"
+            )
+        for i in np.argsort(old_fit, kind="stable")[: n_seed - 1]:
+            row = rng.uniform(-1.0, 1.0, len(feature_names))
+            row[known] = old_pop[i, [column[feature_names[j]] for j in known]]
+            rows.append(row)
+    while len(rows) < n_seed:
+        mask = base.copy()
+        flip = rng.choice(len(feature_names), size=min(len(feature_names), int(rng.integers(1, 4))), replace=False)
+        mask[flip] = ~mask[flip]
+        rows.append(_mask_position(mask, rng))
+
+    print(f"🌱 Warm start from {model_path}: {int(base.sum())}/{len(carried)} selected features carried over, "
+          f"{len(feature_names) - len(known)} new features, {len(rows)}/{pop} whales seeded")
+    return np.array(rows)
+
+
+def _size_penalty(k, dim):
+    # === Size penalty & diversity reward ===
+    target, alpha = 17, 0.008
+    return alpha * abs(k - target) / max(1, dim)
+
+
+class SubsetObjective:
+    """
+    Feature-subset fitness: weighted Mahalanobis CV error plus size penalty.
+
+    Training data and fold statistics come from a shared-memory `FoldPlan`,
+    so the object pickles as a small handle and can be mapped over a process
+    pool without copying the training data.
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.last_B = self.last_M = 0.0
+
+    def release(self):
+        self.plan.release()
+
+    @property
+    def n_folds(self):
+        return self.plan.n_folds
+
+    def _fold(self, f, selected):
+        plan = self.plan
+        X, y = plan.X, plan.y
+        va = plan.validation(f)
+        Xva, yva = X[np.ix_(va, selected)], y[va]
+        mu_b, mu_m = plan.class_means(f, selected)
+        Sp_inv = np.linalg.pinv(plan.pooled_cov(f, selected))
+
+        # === Mahalanobis distances for the whole validation fold at once ===
+        Db, Dm = Xva - mu_b, Xva - mu_m
+        d_b = _distances(np.einsum("ij,ij->i", Db @ Sp_inv, Db))
+        d_m = _distances(np.einsum("ij,ij->i", Dm @ Sp_inv, Dm))
+
+        weighted_err, errB, errM = _fold_errors(d_b, d_m, yva)
+        weighted_err += _size_penalty(len(selected), X.shape[1])
+        return weighted_err, errB, errM
+
+    def fold_errors(self, mask, folds):
+        """Penalized error of `mask` on each fold in `folds` (for partial-CV scoring)."""
+        selected = np.flatnonzero(np.asarray(mask) > 0.5)
+        if selected.size == 0:
+            return np.full(len(folds), 1e6)
+        return np.array([self._fold(f, selected)[0] for f in folds])
+
+    def __call__(self, mask):
+        selected = np.flatnonzero(np.asarray(mask) > 0.5)
+        if selected.size == 0:
+            return 1e6  # discourage empty subset
+
+        fold_errors, fold_B, fold_M = [], [], []
+
+        for f in range(self.plan.n_folds):
+            weighted_err, errB, errM = self._fold(f, selected)
+            fold_errors.append(weighted_err)
+            fold_B.append(errB)
+            fold_M.append(errM)
+
+        self.last_B = float(np.mean(fold_B))
+        self.last_M = float(np.mean(fold_M))
+        return float(np.mean(fold_errors))
+
+
+class FlipEvaluator:
+    """
+    Scores one- and two-feature flips of a base subset without re-inverting
+    pooled covariances.
+
+    Per fold it keeps the inverse covariance of the base subset together with
+    the whitened validation differences `Q = D @ inv`. Removing a feature is a
+    rank-one downdate and adding one a Schur-complement update of the squared
+    distances, so all single flips of a state are scored with a few matrix
+    products instead of one `pinv` each. Pair flips apply their first flip as
+    a full state update and batch the second. Call `rebase()` after accepting
+    a flip to start again from an exact inverse.
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.selected = None
+        self._folds = []
+
+    def rebase(self, mask):
+        plan = self.plan
+        self.selected = np.flatnonzero(np.asarray(mask) > 0.5)
+        sel = self.selected
+        self._folds = []
+        for f in range(plan.n_folds):
+            va = plan.validation(f)
+            Xva, yva = plan.X[va], plan.y[va]
+            mu_b, mu_m = plan.class_means(f)
+            Sp = plan.pooled_cov(f)
+            inv = np.linalg.pinv(Sp[np.ix_(sel, sel)]) if sel.size else np.zeros((0, 0))
+            Ds = (Xva - mu_b, Xva - mu_m)
+            Qs = tuple(D[:, sel] @ inv for D in Ds)
+            d2s = tuple(np.einsum("ij,ij->i", Q, D[:, sel]) for Q, D in zip(Qs, Ds))
+            self._folds.append((yva, Sp, Ds, (list(sel), inv, Qs, d2s)))
+
+    def score(self, flips):
+        """Fitness of `_flip(base, flip)` for each flip, matching `SubsetObjective`."""
+        groups = {}
+        for n, flip in enumerate(flips):
+            groups.setdefault(tuple(flip[:-1]), []).append((n, flip[-1]))
+
+        base = set(self.selected.tolist())
+        out = np.empty(len(flips), dtype=float)
+        for prefix, items in groups.items():
+            rows = [n for n, _ in items]
+            lasts = [q for _, q in items]
+            prefixed = base ^ set(prefix)
+            sizes = np.array([len(prefixed ^ {q}) for q in lasts])
+
+            fold_errors = np.empty((len(self._folds), len(items)))
+            for f, (yva, Sp, Ds, state) in enumerate(self._folds):
+                for q in prefix:
+                    state = self._step(state, q, Sp, Ds)
+                d2b, d2m = self._last_step(state, lasts, Sp, Ds)
+                weighted_err, _, _ = _fold_errors(_distances(d2b), _distances(d2m), yva)
+                fold_errors[f] = weighted_err + _size_penalty(sizes, self.plan.n_features)
+            out[rows] = np.mean(fold_errors, axis=0)
+            out[rows] = np.where(sizes == 0, 1e6, out[rows])  # discourage empty subset
+        return out
+
+    @staticmethod
+    def _step(state, q, Sp, Ds):
+        """Exact state after flipping feature `q`."""
+        idx, inv, Qs, d2s = state
+        if q in idx:
+            j = idx.index(q)
+            bj, Bjj = inv[:, j], inv[j, j]
+            keep = [c for c in range(len(idx)) if c != j]
+            inv2 = (inv - np.outer(bj, bj) / Bjj)[np.ix_(keep, keep)]
+            Qs2 = tuple((Q - np.outer(Q[:, j], bj) / Bjj)[:, keep] for Q in Qs)
+            d2s2 = tuple(d2 - Q[:, j] ** 2 / Bjj for Q, d2 in zip(Qs, d2s))
+            return idx[:j] + idx[j + 1:], inv2, Qs2, d2s2
+
+        b = Sp[idx, q]
+        u = inv @ b
+        s = Sp[q, q] - b @ u
+        k = len(idx)
+        inv2 = np.empty((k + 1, k + 1))
+        inv2[:k, :k] = inv + np.outer(u, u) / s
+        inv2[:k, k] = inv2[k, :k] = -u / s
+        inv2[k, k] = 1.0 / s
+        es = tuple(D[:, q] - Q @ b for Q, D in zip(Qs, Ds))
+        Qs2 = tuple(np.column_stack([Q - np.outer(e, u) / s, e / s]) for Q, e in zip(Qs, es))
+        d2s2 = tuple(d2 + e ** 2 / s for d2, e in zip(d2s, es))
+        return idx + [q], inv2, Qs2, d2s2
+
+    @staticmethod
+    def _last_step(state, qs, Sp, Ds):
+        """Squared distances (n, len(qs)) after flipping each of `qs` separately."""
+        idx, inv, Qs, d2s = state
+        pos = {q: j for j, q in enumerate(idx)}
+        rem = [c for c, q in enumerate(qs) if q in pos]
+        add = [c for c, q in enumerate(qs) if q not in pos]
+        out = tuple(np.empty((len(d2), len(qs))) for d2 in d2s)
+
+        if rem:
+            js = [pos[qs[c]] for c in rem]
+            diag = np.diag(inv)[js]
+            for o, Q, d2 in zip(out, Qs, d2s):
+                o[:, rem] = d2[:, None] - Q[:, js] ** 2 / diag
+        if add:
+            qa = [qs[c] for c in add]
+            B = Sp[np.ix_(idx, qa)]
+            U = inv @ B
+            s = Sp[qa, qa] - np.sum(B * U, axis=0)
+            for o, Q, D, d2 in zip(out, Qs, Ds, d2s):
+                E = D[:, qa] - Q @ B
+                o[:, add] = d2[:, None] + E ** 2 / s
+        return out
+
 
 # ===============================================================
 #  TRAIN MODULE — Mahalanobis-based EWOA Feature Selection
@@ -15,10 +426,38 @@ def train(processed_dir="data/processed",
           obl_freq=5,
           obl_rate=0.15,
           out="models/model_ewoa_final3.json",
-          folds=5):
+          folds=5,
+          workers=1,
+          cache_size=50000,
+          exact_flips=False,
+          finetune="first",
+          islands=0,
+          migrate_every=10,
+          seed=None,
+          max_evals=None,
+          max_time=None,
+          patience=None,
+          tol=0.0,
+          checkpoint=None,
+          checkpoint_every=10,
+          resume=False,
+          progress=False,
+          log_jsonl=None,
+          surrogate=None,
+          surrogate_keep=0.3,
+          surrogate_explore=0.1,
+          fidelity=None,
+          fidelity_keep=0.5,
+          data=None,
+          warm_start=None,
+          warm_population=None,
+          warm_fraction=0.5,
+          pop_schedule=None,
+          min_pop=4):
 
     # === Load preprocessed features and labels ===
-    X, y, feature_names = load_processed_data(processed_dir)
+    # `data` = preloaded (X, y, feature_names), e.g. shared by sweep workers
+    X, y, feature_names = data if data is not None else load_processed_data(processed_dir)
     dim = X.shape[1]
 
     # === Normalize labels to 0=Benign, 1=Malignant ===
@@ -32,111 +471,132 @@ def train(processed_dir="data/processed",
 
     skf = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
 
-    # ===========================================================
-    #  Objective function (feature-subset fitness)
-    # ===========================================================
-    def objective(mask):
-        selected = [i for i, v in enumerate(mask) if v > 0.5]
-        if not selected:
-            return 1e6  # discourage empty subset
+    # Surrogate and multi-fidelity state is not checkpointed, so a resumed run
+    # would screen candidates differently from an uninterrupted one
+    if checkpoint and resume and (surrogate or fidelity):
+        raise ValueError("--resume cannot be combined with --surrogate or --fidelity (their state is not checkpointed)")
 
-        fold_errors, fold_B, fold_M = [], [], []
+    # Read warm-start inputs before allocating shared memory and worker processes
+    stopping = dict(max_evals=max_evals, max_time=max_time, patience=patience, tol=tol)
+    if warm_start:
+        stopping["init_population"] = _warm_start_population(
+            warm_start, feature_names, pop, warm_fraction, spawn_rngs(seed, 2)[0], warm_population,
+        )
+    elif warm_population:
+        print("⚠️ --warm-population needs --warm-start (its feature_names label the population columns); ignoring it")
 
-        for tr, va in skf.split(X, y):
-            Xtr, Xva = X[tr][:, selected], X[va][:, selected]
-            ytr, yva = y[tr], y[va]
-
-            mu_b = Xtr[ytr == 0].mean(axis=0)
-            mu_m = Xtr[ytr == 1].mean(axis=0)
-
-            Sb = np.cov(Xtr[ytr == 0].T) + 1e-6 * np.eye(len(selected))
-            Sm = np.cov(Xtr[ytr == 1].T) + 1e-6 * np.eye(len(selected))
-            Sp_inv = np.linalg.pinv(0.5 * (Sb + Sm))
-
-            def maha(x, mu):
-                d = x - mu
-                return float(np.sqrt(d @ Sp_inv @ d))
-
-            # === τ sweep ===
-            best_err, best_tau = np.inf, 1.0
-            taus = [0.90, 0.95, 0.98, 1.00, 1.02, 1.05, 1.08, 1.10, 1.12]
-
-            for T in taus:
-                eB = eM = 0
-                for xi, yi in zip(Xva, yva):
-                    d_b, d_m = maha(xi, mu_b), maha(xi, mu_m)
-                    pred = 1 if (d_m / (d_b + 1e-9)) < T else 0
-                    if pred != yi:
-                        if yi == 0: eB += 1
-                        else: eM += 1
-                errB = eB / (np.sum(yva == 0) + 1e-6)
-                errM = eM / (np.sum(yva == 1) + 1e-6)
-                W_B, W_M = 1.0, 1.5
-                weighted = (W_B * errB + W_M * errM) / (W_B + W_M)
-                if weighted < best_err:
-                    best_err, best_tau = weighted, T
-
-            # === Final errors with best τ ===
-            eB = eM = 0
-            for xi, yi in zip(Xva, yva):
-                d_b, d_m = maha(xi, mu_b), maha(xi, mu_m)
-                pred = 1 if (d_m / (d_b + 1e-9)) < best_tau else 0
-                if pred != yi:
-                    if yi == 0: eB += 1
-                    else: eM += 1
-
-            errB = eB / (np.sum(yva == 0) + 1e-6)
-            errM = eM / (np.sum(yva == 1) + 1e-6)
-            weighted_err = (1.0 * errB + 1.5 * errM) / 2.5
-
-            # === Size penalty & diversity reward ===
-            k, target, alpha = len(selected), 17, 0.008
-            weighted_err += alpha * abs(k - target) / max(1, X.shape[1])
+    objective = SubsetObjective(FoldPlan(X, y, skf))
+    executor = None
+    try:
+        # Inside the try, so a failing pool still releases the shared memory
+        executor = make_executor(workers)
+        # The objective only depends on mask > 0.5, so memoize on the packed subset
+        fitness = CachedObjective(objective, capacity=cache_size, executor=executor) if cache_size > 0 else objective
 
-            fold_errors.append(weighted_err)
-            fold_B.append(errB)
-            fold_M.append(errM)
+        def screened(inner, executor=None):
+            # Optional fold-level pruning and surrogate pre-screening for the swarm phase
+            # only; fine-tuning uses full-CV scores
+            if fidelity:
+                cache = inner if isinstance(inner, CachedObjective) else None
+                inner = MultiFidelityObjective(objective, levels=fidelity, keep=fidelity_keep, cache=cache, executor=executor)
+            if surrogate:
+                # Exploration draws come from their own child stream, not the optimizer's
+                inner = SurrogateObjective(inner, model=surrogate, keep=surrogate_keep, explore=surrogate_explore,
+                                           seed=spawn_seeds(seed, 2)[1], executor=executor)
+            return inner
 
-        objective.last_B = float(np.mean(fold_B))
-        objective.last_M = float(np.mean(fold_M))
-        return float(np.mean(fold_errors))
+        swarm_fitness = screened(fitness, executor)
 
-    # ===========================================================
-    #  Run EWOA optimizer
-    # ===========================================================
-    if algo.lower() == "ewoa":
-        best_mask, best_err, hist = run_ewoa(
-            objective, dim, (-1, 1),
-            pop_size=pop, iters=iters,
-            a_strategy=a_strategy,
-            obl_freq=obl_freq,
-            obl_rate=obl_rate
+        checkpointer = None
+        if checkpoint:
+            if islands > 1:
+                print("⚠️ Checkpointing is not supported with --islands; running without checkpoints")
+            else:
+                if not resume and os.path.exists(checkpoint):
+                    os.remove(checkpoint)
+                elif resume and not os.path.exists(checkpoint):
+                    print(f"⚠️ No checkpoint at {checkpoint}; starting a fresh run")
+                elif resume:
+                    print(f"🔁 Resuming optimizer from {checkpoint}")
+                cache = fitness if isinstance(fitness, CachedObjective) else None
+                checkpointer = Checkpointer(checkpoint, every=checkpoint_every, cache=cache)
+
+        callbacks = []
+        if progress:
+            callbacks.append(ProgressBar())
+        if log_jsonl:
+            callbacks.append(JsonlWriter(log_jsonl))
+        if callbacks and islands > 1:
+            print("⚠️ --progress/--log-jsonl are not supported with --islands; running without them")
+
+        # ===========================================================
+        #  Run EWOA optimizer
+        # ===========================================================
+        if algo.lower() == "ewoa" and islands > 1:
+            # Each island process scores its own population (with its own cache copy)
+            island_fitness = CachedObjective(objective, capacity=cache_size) if cache_size > 0 else objective
+            swarm_fitness = screened(island_fitness)
+            best_mask, best_err, hist = run_ewoa_islands(
+                swarm_fitness, dim, (-1, 1),
+                islands=islands, migrate_every=migrate_every,
+                pop_size=pop, iters=iters,
+                a_strategy=a_strategy,
+                obl_freq=obl_freq,
+                obl_rate=obl_rate,
+                pop_schedule=pop_schedule,
+                min_pop_size=min_pop,
+                seed=seed,
+                **stopping,
+            )
+        elif algo.lower() == "ewoa":
+            best_mask, best_err, hist = run_ewoa(
+                swarm_fitness, dim, (-1, 1),
+                pop_size=pop, iters=iters,
+                a_strategy=a_strategy,
+                obl_freq=obl_freq,
+                obl_rate=obl_rate,
+                pop_schedule=pop_schedule,
+                min_pop_size=min_pop,
+                seed=seed,
+                executor=executor,
+                checkpointer=checkpointer,
+                callbacks=callbacks,
+                **stopping,
+            )
+        else:
+            best_mask, best_err, hist = run_woa(
+                swarm_fitness, dim, (-1, 1), pop, iters,
+                seed=seed, executor=executor, checkpointer=checkpointer, callbacks=callbacks, **stopping,
+            )
+
+        # ===========================================================
+        #  Greedy fine-tuning (single + pairwise)
+        # ===========================================================
+        print("🔧 Greedy post-optimization fine-tuning...")
+        evaluator = None if exact_flips else FlipEvaluator(objective.plan)
+        greedy = _best_improvement_pass if finetune == "best" else _greedy_pass
+        singles = [(i,) for i in range(dim)]
+        best_mask, best_score = greedy(
+            fitness, best_mask.copy(), best_err, singles, executor,
+            lambda flip, err: print(f"  ✅ Flip {flip[0]}: {feature_names[flip[0]]} → {err:.4f}"),
+            evaluator=evaluator,
         )
-    else:
-        best_mask, best_err, hist = run_woa(objective, dim, (-1, 1), pop, iters)
 
-    # ===========================================================
-    #  Greedy fine-tuning (single + pairwise)
-    # ===========================================================
-    print("🔧 Greedy post-optimization fine-tuning...")
-    best_subset, best_score = best_mask.copy(), best_err
-    for i in range(dim):
-        candidate = best_subset.copy(); candidate[i] = 1 - candidate[i]
-        err = objective(candidate)
-        if err < best_score:
-            best_subset, best_score = candidate, err
-            print(f"  ✅ Flip {i}: {feature_names[i]} → {err:.4f}")
-    best_mask = best_subset
-
-    print("🔁 Second-pass pairwise fine-tuning...")
-    for i in range(dim):
-        for j in range(i + 1, dim):
-            cand = best_mask.copy()
-            cand[i], cand[j] = 1 - cand[i], 1 - cand[j]
-            err = objective(cand)
-            if err < best_score - 1e-4:
-                best_mask, best_score = cand, err
-                print(f"  ✅ Pair flip ({feature_names[i]}, {feature_names[j]}) → {err:.4f}")
+        print("🔁 Second-pass pairwise fine-tuning...")
+        pairs = [(i, j) for i in range(dim) for j in range(i + 1, dim)]
+        best_mask, best_score = greedy(
+            fitness, best_mask, best_score, pairs, executor,
+            lambda flip, err: print(f"  ✅ Pair flip ({feature_names[flip[0]]}, {feature_names[flip[1]]}) → {err:.4f}"),
+            tol=1e-4, evaluator=evaluator,
+        )
+
+        # Exact full-CV score and per-class errors of the final subset; the flip
+        # evaluator's incremental score can drift and workers do not report back
+        best_score = objective(best_mask)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        objective.release()
 
     # ===========================================================
     #  Save final model
@@ -154,6 +614,16 @@ def train(processed_dir="data/processed",
         "a_strategy": a_strategy,
         "obl_freq": obl_freq,
         "obl_rate": obl_rate,
+        "pop_schedule": pop_schedule,
+        "finetune": finetune,
+        "islands": islands,
+        "warm_start": warm_start,
+        "seed": seed,
+        "iterations_run": len(hist.best_fitness_per_iter),
+        "evaluations": hist.evaluations,
+        "stop_reason": hist.stop_reason,
+        "surrogate": swarm_fitness.stats() if isinstance(swarm_fitness, SurrogateObjective) and islands <= 1 else None,
+        "fidelity": find_objective(swarm_fitness, MultiFidelityObjective).stats() if fidelity and islands <= 1 else None,
         "feature_names": feature_names,
         "selected_idx": selected_idx,
         "selected_names": [feature_names[i] for i in selected_idx],
@@ -175,7 +645,24 @@ def train(processed_dir="data/processed",
 
     print(f"✅ Model saved to {out}")
     print(f"Features: {dim}, Selected: {len(selected_idx)}")
+    print(f"Optimizer: {len(hist.best_fitness_per_iter)} iterations, "
+          f"{hist.evaluations} evaluations (stop: {hist.stop_reason}), "
+          f"{hist.eval_seconds:.1f}s in the objective")
     print(f"CV Error: {best_score:.4f} "
           f"(Benign err={objective.last_B:.4f}, Malignant err={objective.last_M:.4f})")
+    if isinstance(fitness, CachedObjective):
+        print(f"Fitness cache: {fitness.hits} hits, {fitness.misses} misses "
+              f"({fitness.hit_rate:.1%} hit rate, {len(fitness)} entries)")
+    if model["surrogate"] is not None:
+        s = model["surrogate"]
+        accuracy = "n/a" if s["mae"] is None else f"MAE {s['mae']:.4f}"
+        if s["rank_corr"] is not None:
+            accuracy += f", rank corr {s['rank_corr']:.2f}"
+        print(f"Surrogate ({s['model']}): {s['true_fraction']:.1%} of new subsets truly evaluated "
+              f"({s['true_evals']} true, {s['predicted']} predicted; {accuracy})")
+    if model["fidelity"] is not None:
+        s = model["fidelity"]
+        print(f"Multi-fidelity CV {s['levels']}: {s['full_evals']} of {s['candidates']} subsets ran full CV, "
+              f"{s['pruned']} pruned ({s['fold_fraction']:.1%} of fold evaluations)")
 
     return model
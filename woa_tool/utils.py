@@ -1,16 +1,40 @@
 from __future__ import annotations
 
 import numpy as np
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
+
+SeedLike = Union[None, int, np.random.SeedSequence]
 
 
 def ensure_bounds(position: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
-    return np.minimum(np.maximum(position, lower), upper)
+    clipped = np.maximum(position, lower)
+    return np.minimum(clipped, upper, out=clipped)
+
+
+def make_rng(seed: SeedLike = None, rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    # An explicit Generator wins; otherwise build one from the seed (int, SeedSequence or None)
+    return rng if rng is not None else np.random.default_rng(seed)
+
+
+def spawn_seeds(seed: SeedLike, n: int) -> List[np.random.SeedSequence]:
+    # Independent child streams for parallel runs, islands or workers
+    ss = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return ss.spawn(n)
+
+
+def spawn_rngs(seed: SeedLike, n: int) -> List[np.random.Generator]:
+    return [np.random.default_rng(s) for s in spawn_seeds(seed, n)]
 
 
-def initialize_population(pop_size: int, dim: int, bounds: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+def initialize_population(
+    pop_size: int,
+    dim: int,
+    bounds: Tuple[np.ndarray, np.ndarray],
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    rng = make_rng(rng=rng)
     lower, upper = bounds
-    return lower + (upper - lower) * np.random.rand(pop_size, dim)
+    return lower + (upper - lower) * rng.random((pop_size, dim))
 
 
 def population_diversity(pop: np.ndarray) -> float: